@@ -0,0 +1,277 @@
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation
+import threading
+import re
+
+from log_symbols import LogSymbols
+
+from .binary_api import BINARY_API
+from .http_api import HTTP_APIv2
+
+
+def parse_summary(stdout: str) -> dict:
+    """Parse 'info' command output ('Label | value' rows) into dict"""
+    summary = {}
+    for line in stdout.splitlines():
+        if '|' not in line:
+            continue
+        key, value = [cell.strip() for cell in line.split('|', 1)]
+        if key and not set(key) <= {'-'}:
+            summary[key] = value
+    return summary
+
+
+def parse_table(stdout: str) -> list:
+    """
+    Parse 'txs'/'outputs' command table into list of dicts. Header lines between
+    top rule and '===' rule are joined per column ('Num.' + 'Inputs'), columns are
+    found by title positions (titles separated by at least two spaces). Lines with
+    empty first column continue cells of previous row ('Sent Tx' + '- Cancelled').
+    """
+    lines = stdout.splitlines()
+    for i, line in enumerate(lines[1:], start=1):
+        if line.strip() and set(line.strip()) <= {'='}:
+            break
+    else:
+        return []
+
+    header = []
+    for line in reversed(lines[:i]):
+        if not line.strip() or set(line.strip()) <= {'-'}:
+            break
+        header.insert(0, line)
+
+    starts = sorted({m.start() for line in header for m in re.finditer(r'\S+(?: \S+)*', line)})
+    bounds = list(zip(starts, starts[1:] + [None]))
+
+    def cells(line: str) -> list:
+        return [line[start:end].strip() for start, end in bounds]
+
+    titles = [' '.join(part for part in parts if part) for parts in zip(*[cells(line) for line in header])]
+
+    rows = []
+    for line in lines[i + 1:]:
+        if not line.strip() or line.startswith('Command') or set(line.strip()) <= {'-'}:
+            break
+        values = cells(line)
+        if rows and not values[0]:
+            for title, value in zip(titles, values):
+                if value:
+                    rows[-1][title] = f"{rows[-1][title]} {value}".strip()
+            continue
+        rows.append(dict(zip(titles, values)))
+    return rows
+
+
+def _value(value: str):
+    return None if value in (None, '', 'None') else value
+
+
+def _int(value: str):
+    value = _value(value)
+    return int(value) if value is not None else None
+
+
+def _bool(value: str):
+    value = _value(value)
+    return value.lower() in ('true', 'yes') if value is not None else None
+
+
+def _amount(value: str, dec: int = 8):
+    """Convert CLI decimal EPIC amount to integer base units, as used by owner API"""
+    value = _value(value)
+    if value is None:
+        return None
+    try:
+        return int(Decimal(value.replace(',', '')) * 10 ** dec)
+    except InvalidOperation:
+        return None
+
+
+# CLI 'txs' type titles to owner API TxLogEntryType
+TX_TYPES = {
+    'Confirmed Coinbase': 'ConfirmedCoinbase',
+    'Received Tx': 'TxReceived',
+    'Sent Tx': 'TxSent',
+    'Received Tx - Cancelled': 'TxReceivedCancelled',
+    'Sent Tx - Cancelled': 'TxSentCancelled',
+    }
+
+# CLI table column title: (owner API key, converter)
+TX_COLUMNS = {
+    'Id': ('id', _int),
+    'Type': ('tx_type', lambda v: TX_TYPES.get(' '.join(v.split()), v)),
+    'Shared Transaction Id': ('tx_slate_id', _value),
+    'Creation Time': ('creation_ts', _value),
+    'Confirmed?': ('confirmed', _bool),
+    'Confirmation Time': ('confirmation_ts', _value),
+    'Num. Inputs': ('num_inputs', _int),
+    'Num. Outputs': ('num_outputs', _int),
+    'Amount Credited': ('amount_credited', _amount),
+    'Amount Debited': ('amount_debited', _amount),
+    'Fee': ('fee', _amount),
+    'Kernel': ('kernel_excess', _value),
+    }
+
+OUTPUT_COLUMNS = {
+    'Output Commitment': ('commit', _value),
+    'MMR Index': ('mmr_index', _int),
+    'Block Height': ('height', _int),
+    'Locked Until': ('lock_height', _int),
+    'Status': ('status', _value),
+    'Coinbase?': ('is_coinbase', _bool),
+    '# Confirms': ('num_confirmations', _int),
+    'Value': ('value', _amount),
+    'Tx': ('tx_log_entry', _int),
+    }
+
+# CLI 'info' label prefix: owner API retrieve_summary_info key
+SUMMARY_LABELS = {
+    'Confirmed Total': 'total',
+    'Awaiting Confirmation': 'amount_awaiting_confirmation',
+    'Awaiting Finalization': 'amount_awaiting_finalization',
+    'Immature Coinbase': 'amount_immature',
+    'Locked by previous transaction': 'amount_locked',
+    'Currently Spendable': 'amount_currently_spendable',
+    }
+
+
+def parse_info(stdout: str) -> dict:
+    """'info' command output as owner API retrieve_summary_info result (integer amounts)"""
+    info = {}
+    height = re.search(r'as of height (\d+)', stdout)
+    if height:
+        info['last_confirmed_height'] = int(height.group(1))
+
+    for label, value in parse_summary(stdout).items():
+        for prefix, key in SUMMARY_LABELS.items():
+            if label.startswith(prefix):
+                info[key] = _amount(value)
+                confirmations = re.search(r'\(< ?(\d+)\)', label)
+                if key == 'amount_awaiting_confirmation' and confirmations:
+                    info['minimum_confirmations'] = int(confirmations.group(1))
+                break
+    return info
+
+
+def parse_txs(stdout: str) -> list:
+    """'txs' command table as owner API retrieve_txs result (integer amounts)"""
+    return [{key: convert(row[title]) for title, (key, convert) in TX_COLUMNS.items() if title in row}
+            for row in parse_table(stdout)]
+
+
+def parse_outputs(stdout: str) -> list:
+    """'outputs' command table as owner API retrieve_outputs result (integer amounts)"""
+    results = []
+    for row in parse_table(stdout):
+        output = {key: convert(row[title]) for title, (key, convert) in OUTPUT_COLUMNS.items() if title in row}
+        results.append({'commit': output.get('commit'), 'output': output})
+    return results
+
+
+class AccountManager:
+    """
+    Account-scoped wallet queries. Owner API keeps single active account per wallet
+    process, so switching account through it is serialized by one lock. Queries for
+    many accounts run concurrently as separate CLI processes using '-a' flag,
+    without touching wallet's active account. CLI output is returned in owner API
+    format: same keys, integer amounts in base units.
+    """
+    commands = {'info': parse_info, 'txs': parse_txs, 'outputs': parse_outputs}
+
+    def __init__(self, binary: BINARY_API, http: HTTP_APIv2 = None):
+        self.binary = binary
+        self.http = http
+        self.active = 'default'
+        self._lock = threading.RLock()
+
+    def accounts(self) -> list:
+        """Return list of wallet accounts: [{'label': str, 'path': str}, ...]"""
+        with self._lock:
+            response = self.http.accounts()
+        return response['result']['Ok'] if response else []
+
+    def create_account_path(self, label: str):
+        with self._lock:
+            response = self.http.create_account_path(label=label)
+        return response['result']['Ok'] if response else False
+
+    def set_active_account(self, label: str):
+        with self._lock:
+            response = self.http.set_active_account(label=label)
+            if response:
+                self.active = label
+        return bool(response)
+
+    @contextmanager
+    def scoped(self, label: str):
+        """
+        Use owner API with given active account, other callers of this manager
+        wait until block is done, previous active account is restored after.
+        """
+        with self._lock:
+            previous = self.active
+            if not self.set_active_account(label):
+                raise ValueError(f"Can't set active account '{label}'")
+            try:
+                yield self.http
+            finally:
+                self.set_active_account(previous)
+
+    def _labels(self, accounts: list = None) -> list:
+        if accounts:
+            return list(accounts)
+        return [account['label'] for account in self.accounts()]
+
+    def query(self, password: str, accounts: list = None,
+              commands: tuple = ('info', 'txs', 'outputs')) -> dict:
+        """
+        Run given CLI commands for all accounts concurrently, return per-account map:
+        {label: {'info': dict, 'txs': list, 'outputs': list}}
+        """
+        futures = {}
+        for label in self._labels(accounts):
+            for command in commands:
+                futures[(label, command)] = self.binary._submit_command(
+                    command=command, password=password, account=label)
+
+        results = {}
+        for (label, command), future in futures.items():
+            process = future.result()
+            if 'successfully' in process.stdout:
+                value = self.commands[command](process.stdout)
+            else:
+                print(f"{LogSymbols.ERROR.value} {command} for account '{label}' failed: "
+                      f"{process.stdout.strip() or process.stderr.strip()}")
+                value = None
+            results.setdefault(label, {})[command] = value
+        return results
+
+    def summary_info(self, password: str, accounts: list = None) -> dict:
+        return {label: data['info'] for label, data in
+                self.query(password, accounts, commands=('info',)).items()}
+
+    def txs(self, password: str, accounts: list = None) -> dict:
+        return {label: data['txs'] for label, data in
+                self.query(password, accounts, commands=('txs',)).items()}
+
+    def outputs(self, password: str, accounts: list = None) -> dict:
+        return {label: data['outputs'] for label, data in
+                self.query(password, accounts, commands=('outputs',)).items()}
+
+    def query_owner_api(self, accounts: list = None, **params) -> dict:
+        """
+        Same per-account map from owner API (raw JSON results), accounts are
+        switched one by one under the manager lock.
+        """
+        results = {}
+        for label in self._labels(accounts):
+            with self.scoped(label) as http:
+                results[label] = {
+                    'info': http.retrieve_summary_info(**params),
+                    'txs': http.retrieve_txs(),
+                    'outputs': http.retrieve_outputs(),
+                    }
+            for key, response in results[label].items():
+                results[label][key] = response['result']['Ok'][1] if response else None
+        return results
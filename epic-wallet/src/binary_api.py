@@ -1,22 +1,35 @@
 from typing import Union
 import subprocess
+import platform
 import time
 import os
 
 from log_symbols import LogSymbols
 from halo import Halo
 
+from .executor import CommandExecutor
+from .node_pool import NodePool
 from . import tools
 
 
 class BINARY_API:
     """Python wrapper for Epic-Cash CLI Wallet using epic-wallet binary file"""
-    binary_file = 'epic-wallet.exe'
+    binary_file = 'epic-wallet.exe' if platform.system() == 'Windows' else 'epic-wallet'
     spinner = Halo(text='', spinner='growVertical')
-
-    def __init__(self, settings: dict = None, binary_path: str = None):
+    # Command output pointing to unreachable node, lowercase. Read commands still finish
+    # 'successfully' from local cache then, only printing the live chain warning
+    node_errors = ('failed to verify data against a live chain', 'from local cache and possibly invalid',
+                   'os error 10061', 'os error 111', 'connection refused',
+                   'unable to contact node', 'cannot make request', 'node not responding')
+    # Commands safe to re-run on another node, never payment commands (send, finalize, ...)
+    failover_commands = ('info', 'txs', 'outputs', 'check')
+
+    def __init__(self, settings: dict = None, binary_path: str = None,
+                 executor: CommandExecutor = None):
         self.binary_path = binary_path
         self.settings = settings
+        self.executor = executor if executor else CommandExecutor.shared()
+        self.node_pool: Union[NodePool, None] = None
 
         self.check_node_api_http_addr: str = ''
         self.owner_api_listen_port: Union[str, int] = 0
@@ -47,13 +60,23 @@ class BINARY_API:
         self.binary_path = binary_path
         self.binary = os.path.join(self.binary_path, self.binary_file)
 
+    @property
+    def working_dir(self) -> str:
+        """Directory with loaded epic-wallet.toml (binary path if no settings loaded)"""
+        if self.top_level_path and os.path.isdir(self.top_level_path):
+            return self.top_level_path
+        return self.binary_path
+
+    def set_node_pool(self, node_pool: NodePool = None):
+        """Use NodePool to pick node for every command, None to use check_node_api_http_addr"""
+        self.node_pool = node_pool
+
     # command: str, password: str, cwd=None,
     # extra_args: list = None, account: str = None,
 
-    @tools.manage_cwd
-    def _command(self, **kwargs):
-        """Prepare epic-wallet binary command-line commands and execute via subprocess.run()"""
-        cwd = kwargs['cwd'] if 'cwd' in kwargs.keys() else os.getcwd()
+    def _build_command(self, **kwargs):
+        """Prepare epic-wallet binary command-line arguments and working directory"""
+        cwd = kwargs['cwd'] if kwargs.get('cwd') else self.working_dir
         args = [self.binary]
         cut_print = 5
 
@@ -70,15 +93,62 @@ class BINARY_API:
         args += kwargs['extra_args'] if 'extra_args' in kwargs.keys() else []
 
         args = [str(arg) for arg in args]
-        string_cmd = f'Command: {" ".join(c for c in args[cut_print:])}'
-        print(string_cmd)
-        # print(args)
+        print(f'Command: {" ".join(c for c in args[cut_print:])}')
+        return args, cwd
+
+    def _node_candidates(self, kwargs: dict) -> list:
+        """Node addresses to try in order, explicit node_address disables failover"""
+        if 'node_address' in kwargs.keys():
+            return [kwargs['node_address']]
+        if not self.node_pool:
+            return [self.check_node_api_http_addr]
+        if kwargs.get('command') in self.failover_commands:
+            return self.node_pool.ranked()
+        return [self.node_pool.select()]
+
+    def _node_failed(self, process: subprocess.CompletedProcess, node: str, command: str) -> bool:
+        """
+        Check read command output for unreachable node errors, report node to the pool.
+        Other commands talk to payment recipients too, their connection errors can't be
+        told apart from node ones.
+        """
+        if not self.node_pool or command not in self.failover_commands:
+            return False
+        output = f"{process.stdout} {process.stderr}".lower()
+        if any(error in output for error in self.node_errors):
+            self.node_pool.mark_failed(node)
+            return True
+        return False
+
+    def _command(self, **kwargs):
+        """Prepare epic-wallet binary command-line commands and execute via subprocess.run()"""
         self.spinner.start(text=f" working...")
-        process = subprocess.run(args, capture_output=True, text=True, cwd=cwd)
+        return self._execute(**kwargs)
+
+    async def _command_async(self, **kwargs):
+        """Execute epic-wallet binary command in asyncio event loop, return CompletedProcess"""
+        for node in self._node_candidates(kwargs):
+            args, cwd = self._build_command(**dict(kwargs, node_address=node))
+            process = await self.executor.run_async(args, cwd=cwd)
+            if not self._node_failed(process, node, kwargs.get('command')):
+                break
+
+        return process
+
+    def _submit_command(self, **kwargs):
+        """Execute epic-wallet binary command in executor worker pool, return Future"""
+        return self.executor.submit_call(self._execute, **kwargs)
+
+    def _execute(self, **kwargs):
+        """Execute command in current thread, fail over to next node from the pool"""
+        for node in self._node_candidates(kwargs):
+            args, cwd = self._build_command(**dict(kwargs, node_address=node))
+            process = self.executor.run(args, cwd=cwd)
+            if not self._node_failed(process, node, kwargs.get('command')):
+                break
 
         return process
 
-    @tools.manage_cwd
     def _create(self, **kwargs):
         extra_args = ['-h']
         if 'wallet_data_path' not in kwargs.keys():
@@ -98,9 +168,7 @@ class BINARY_API:
                                cwd=kwargs['wallet_data_path'])
 
         if 'completed successfully' in output.stdout:
-            mnemonic = output.stdout.split('Your recovery phrase is:')[1]
-            mnemonic = mnemonic.split('Please back-up these words in a non-digital format.')[0]
-            mnemonic = mnemonic.strip()
+            mnemonic = self.parse_mnemonic(output.stdout)
             print(tools.icon('success'), 'Wallet created successfully!\n'
                                          f'{tools.icon("success")}'
                                          'Please backup your MNEMONIC SEED PHRASE:\n'
@@ -113,7 +181,13 @@ class BINARY_API:
         else:
             print(tools.icon('error'), output.stderr)
 
-    @tools.manage_cwd
+    @staticmethod
+    def parse_mnemonic(stdout: str) -> str:
+        """Extract recovery phrase from 'init' command output"""
+        mnemonic = stdout.split('Your recovery phrase is:')[1]
+        mnemonic = mnemonic.split('Please back-up these words in a non-digital format.')[0]
+        return mnemonic.strip()
+
     def _run_listener(self, **kwargs):
         # TODO: Handlers for Keybase and TOR listeners/API
         port = self.api_listen_port
@@ -128,10 +202,11 @@ class BINARY_API:
         self.spinner.start(text=f"")
         args = [self.binary,
                 '-p', kwargs['password'],
-                '-r', self.check_node_api_http_addr,
+                '-r', self.node_pool.select() if self.node_pool else self.check_node_api_http_addr,
                 command]
         time.sleep(0.2)
-        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   cwd=self.working_dir)
 
         self.spinner.stop_and_persist(
             tools.icon('success'),
@@ -186,11 +261,27 @@ class BINARY_API:
         else:
             self.spinner.stop_and_persist(tools.icon('error'), process.stdout)
 
+    async def info_async(self, **kwargs):
+        """Return wallet balance command output, without blocking asyncio event loop"""
+        return await self._command_async(command='info', **kwargs)
+
+    async def txs_async(self, **kwargs):
+        """Return wallet transaction history command output, without blocking asyncio event loop"""
+        return await self._command_async(command='txs', **kwargs)
+
+    async def outputs_async(self, **kwargs):
+        """Return wallet outputs command output, without blocking asyncio event loop"""
+        return await self._command_async(command='outputs', **kwargs)
+
     def send(self, **kwargs):
         """Send Epic-Cash via different methods"""
         tx = kwargs['transaction']
         assert (tx.validate())
 
+        # Binary runs in working_dir, file paths are resolved against caller's cwd
+        if 'file' in tx.method:
+            tx.destination = os.path.abspath(tx.destination)
+
         kwargs['extra_args'] = ['-m', tx.method,
                                 '-d', tx.destination,
                                 '-s', tx.strategy,
@@ -227,6 +318,7 @@ class BINARY_API:
 
     def receive(self, **kwargs) -> None:
         """Load sender's transaction file, sign it and produce new response file"""
+        kwargs['file_path'] = os.path.abspath(kwargs['file_path'])
         if os.path.isfile(kwargs['file_path']):
             kwargs['extra_args'] = ['-i', kwargs['file_path']]
 
@@ -245,6 +337,7 @@ class BINARY_API:
 
     def finalize(self, **kwargs) -> None:
         """Load receiver's transaction response file, sign it and send transaction to network"""
+        kwargs['file_path'] = os.path.abspath(kwargs['file_path'])
         if os.path.isfile(kwargs['file_path']):
             kwargs['extra_args'] = ['-i', kwargs['file_path']]
 
@@ -329,9 +422,45 @@ class BINARY_API:
         pass
 
     def invoice(self, **kwargs):
-        """for V3 API"""
-        pass
+        """Issue invoice transaction file, payer has to process it with 'pay' command"""
+        destination = os.path.abspath(kwargs['file_path'])
+        destination = destination if destination.endswith('.tx') else f"{destination}.tx"
+        kwargs['extra_args'] = ['-d', destination]
+        if kwargs.get('message'):
+            kwargs['extra_args'] += ['-g', kwargs['message']]
+        kwargs['extra_args'] += [kwargs['amount']]
+
+        process = self._command(command='invoice', **kwargs)
+
+        if 'successfully' in process.stdout:
+            self.spinner.stop_and_persist(
+                tools.icon('success'), f'Invoice file "{destination}" successfully created!')
+            return destination
+        else:
+            self.spinner.stop_and_persist(tools.icon('error'), 'Invoice Failed!')
+            print(tools.icon('error'), process.stdout)
+        return False
 
     def process_invoice(self, **kwargs):
-        """for V3 API"""
-        pass
\ No newline at end of file
+        """Load invoice transaction file, pay it and produce new response file for issuer"""
+        kwargs['file_path'] = os.path.abspath(kwargs['file_path'])
+        if os.path.isfile(kwargs['file_path']):
+            kwargs['extra_args'] = ['-i', kwargs['file_path']]
+            if kwargs.get('destination'):
+                kwargs['extra_args'] += ['-d', os.path.abspath(kwargs['destination'])]
+            if kwargs.get('strategy'):
+                kwargs['extra_args'] += ['-s', kwargs['strategy']]
+
+            process = self._command(command='pay', **kwargs)
+
+            if 'successfully' in process.stdout:
+                self.spinner.stop_and_persist(
+                    tools.icon('success'), f'Invoice paid successfully!')
+                print(f'{tools.icon("info")} Please send "{kwargs["file_path"]}.response" file back to issuer.')
+                return True
+            else:
+                self.spinner.stop_and_persist(tools.icon('error'), 'Invoice Payment Failed!')
+                print(tools.icon('error'), process.stdout)
+        else:
+            print(tools.icon('error'), f'"{kwargs["file_path"]}" file does not exists!')
+        return False
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import threading
+import asyncio
+import weakref
+
+
+class CommandExecutor:
+    """
+    Execute epic-wallet binary commands without touching global process state.
+    Working directory is passed per process, commands can be awaited in asyncio
+    event loop or submitted to bounded pool of worker threads.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='epic-wallet')
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def shared(cls):
+        """Return executor instance shared by all BINARY_API instances"""
+        with cls._shared_lock:
+            if not cls._shared:
+                cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def run(args: list, cwd: str = None) -> subprocess.CompletedProcess:
+        """Execute command in current thread, block until finished"""
+        return subprocess.run(args, capture_output=True, text=True, cwd=cwd)
+
+    def submit(self, args: list, cwd: str = None):
+        """Execute command in worker pool, return concurrent.futures.Future"""
+        return self._pool.submit(self.run, args, cwd)
+
+    def submit_call(self, func, *args, **kwargs):
+        """Execute any callable in worker pool, return concurrent.futures.Future"""
+        return self._pool.submit(func, *args, **kwargs)
+
+    async def run_async(self, args: list, cwd: str = None) -> subprocess.CompletedProcess:
+        """Execute command via asyncio subprocess, at most max_workers at once"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+
+        async with self._semaphores[loop]:
+            process = await asyncio.create_subprocess_exec(
+                *args, cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE)
+            stdout, stderr = await process.communicate()
+
+        return subprocess.CompletedProcess(args=args,
+                                           returncode=process.returncode,
+                                           stdout=stdout.decode(errors='replace'),
+                                           stderr=stderr.decode(errors='replace'))
+
+    @staticmethod
+    async def gather(*coroutines):
+        """Run many command coroutines concurrently, return results in order"""
+        return await asyncio.gather(*coroutines)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,195 @@
+from datetime import datetime
+from typing import Union
+import csv
+import os
+import re
+
+from log_symbols import LogSymbols
+from halo import Halo
+
+from .http_api import HTTP_APIv2
+from .tools import normalize
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class TransactionExporter:
+    """
+    Stream wallet transaction history to CSV or Parquet file. Tx log and outputs
+    are requested from owner_api once per export (two calls), rows are built and
+    written in chunks. Owner API has to be running.
+
+    Memory use is not flat: owner_api has no paging for retrieve_txs/retrieve_outputs
+    (only single tx_id filter, one call per id), so the whole tx log, all outputs and
+    {tx id: height} map are held during export, growing with history length. Only
+    export rows are kept to :param chunk_size:.
+
+    :param http: HTTP_APIv2, owner_api client (its settings are used by own client)
+    :param chunk_size: int, rows kept in memory before writing to file
+    """
+    columns = {
+        'id': 'int64',
+        'tx_type': 'string',
+        'tx_slate_id': 'string',
+        'creation_ts': 'string',
+        'confirmation_ts': 'string',
+        'confirmed': 'bool',
+        'confirmation_height': 'int64',
+        'amount_credited': 'int64',
+        'amount_debited': 'int64',
+        'amount_net': 'int64',
+        'fee': 'int64',
+        'amount_credited_epic': 'float64',
+        'amount_debited_epic': 'float64',
+        'amount_net_epic': 'float64',
+        'fee_epic': 'float64',
+        'num_inputs': 'int64',
+        'num_outputs': 'int64',
+        'kernel_excess': 'string',
+        }
+
+    def __init__(self, http: HTTP_APIv2, chunk_size: int = 500):
+        # Own client with disabled spinner, caller's (shared) spinner is left as is
+        self.http = HTTP_APIv2(settings=http.settings)
+        self.http.spinner = Halo(enabled=False)
+        self.chunk_size = chunk_size
+
+    def iter_txs(self, since_id: int = None, refresh_from_node: bool = True):
+        """Yield tx log entries with id greater than :param since_id: (whole tx log is fetched)"""
+        response = self.http.retrieve_txs(refresh_from_node=refresh_from_node)
+        if not response:
+            return
+        for tx in response['result']['Ok'][1]:
+            if since_id is None or tx['id'] > since_id:
+                yield tx
+
+    def confirmation_heights(self) -> dict:
+        """{tx id: height of block with outputs created by transaction}, from single outputs query"""
+        response = self.http.retrieve_outputs(include_spent=True, refresh_from_node=False)
+        if not response:
+            return {}
+
+        heights = {}
+        for output in response['result']['Ok'][1]:
+            tx_id, height = output['output'].get('tx_log_entry'), output['output'].get('height')
+            if tx_id is not None and height:
+                heights[int(tx_id)] = max(heights.get(int(tx_id), 0), int(height))
+        return heights
+
+    @staticmethod
+    def _int(value) -> int:
+        return int(value) if value not in (None, '') else 0
+
+    def row(self, tx: dict, heights: dict = None) -> dict:
+        credited = self._int(tx.get('amount_credited'))
+        debited = self._int(tx.get('amount_debited'))
+        fee = self._int(tx.get('fee'))
+        return {
+            'id': tx['id'],
+            'tx_type': tx.get('tx_type'),
+            'tx_slate_id': tx.get('tx_slate_id'),
+            'creation_ts': tx.get('creation_ts'),
+            'confirmation_ts': tx.get('confirmation_ts'),
+            'confirmed': bool(tx.get('confirmed')),
+            'confirmation_height': heights.get(tx['id']) if heights and tx.get('confirmed') else None,
+            'amount_credited': credited,
+            'amount_debited': debited,
+            'amount_net': credited - debited,
+            'fee': fee,
+            'amount_credited_epic': normalize(credited),
+            'amount_debited_epic': normalize(debited),
+            'amount_net_epic': normalize(credited - debited),
+            'fee_epic': normalize(fee),
+            'num_inputs': tx.get('num_inputs'),
+            'num_outputs': tx.get('num_outputs'),
+            'kernel_excess': tx.get('kernel_excess'),
+            }
+
+    @staticmethod
+    def _timestamp(value: Union[str, datetime, None]) -> Union[datetime, None]:
+        if not value or isinstance(value, datetime):
+            return value
+        # Wallet timestamps may have nanoseconds, datetime supports microseconds only
+        value = re.sub(r'(\.\d{6})\d+', r'\1', value.replace('Z', '+00:00'))
+        return datetime.fromisoformat(value)
+
+    def iter_rows(self, since_id: int = None, since_ts: Union[str, datetime] = None,
+                  with_height: bool = True, refresh_from_node: bool = True):
+        """Yield export rows, optionally only for transactions created at/after :param since_ts:"""
+        since_ts = self._timestamp(since_ts)
+        if since_ts and not since_ts.tzinfo:
+            since_ts = since_ts.astimezone()
+
+        txs = self.iter_txs(since_id=since_id, refresh_from_node=refresh_from_node)
+        # Outputs after txs, so they are read from wallet state refreshed by first call
+        heights = None
+        for tx in txs:
+            if since_ts and tx.get('creation_ts') and self._timestamp(tx['creation_ts']) < since_ts:
+                continue
+            if with_height and heights is None:
+                heights = self.confirmation_heights()
+            yield self.row(tx, heights=heights)
+
+    def _chunks(self, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _write_csv(self, file_path: str, chunks, append: bool):
+        header = not (append and os.path.isfile(file_path) and os.path.getsize(file_path))
+        with open(file_path, 'a' if append else 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.columns.keys()))
+            if header:
+                writer.writeheader()
+            for chunk in chunks:
+                writer.writerows(chunk)
+                file.flush()
+                yield chunk
+
+    def _write_parquet(self, file_path: str, chunks):
+        if not pyarrow:
+            raise ImportError("Parquet export requires 'pyarrow' package (pip install pyarrow)")
+
+        schema = pyarrow.schema([(name, pyarrow.type_for_alias(type_)) for name, type_ in self.columns.items()])
+        with pyarrow.parquet.ParquetWriter(file_path, schema) as writer:
+            for chunk in chunks:
+                table = pyarrow.Table.from_pylist(chunk, schema=schema)
+                writer.write_table(table)
+                yield chunk
+
+    def export(self, file_path: str, format_: str = None, since_id: int = None,
+               since_ts: Union[str, datetime] = None, with_height: bool = True,
+               append: bool = False, refresh_from_node: bool = True) -> dict:
+        """
+        Export transactions to :param file_path: (format from extension if not given).
+        For incremental exports pass 'last_id' from previous result as :param since_id:
+        (and append=True for CSV, Parquet files can't be appended - use new file).
+        :return: dict {'rows': int, 'last_id': int|None, 'file_path': str}
+        """
+        format_ = (format_ if format_ else os.path.splitext(file_path)[1].lstrip('.')).lower()
+        if format_ not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported export format '{format_}', use 'csv' or 'parquet'")
+
+        chunks = self._chunks(self.iter_rows(since_id=since_id, since_ts=since_ts, with_height=with_height,
+                                             refresh_from_node=refresh_from_node))
+        if format_ == 'csv':
+            written = self._write_csv(file_path, chunks, append=append)
+        else:
+            written = self._write_parquet(file_path, chunks)
+
+        rows, last_id = 0, since_id
+        for chunk in written:
+            rows += len(chunk)
+            last_id = max(last_id if last_id is not None else -1, chunk[-1]['id'])
+
+        print(f"{LogSymbols.SUCCESS.value} Exported {rows} transactions to {file_path}")
+        return {'rows': rows, 'last_id': last_id, 'file_path': file_path}
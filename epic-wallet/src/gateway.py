@@ -0,0 +1,425 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import Future
+from decimal import Decimal
+from socketserver import ThreadingUnixStreamServer
+import http.client
+import threading
+import argparse
+import binascii
+import getpass
+import secrets
+import base64
+import socket
+import hmac
+import json
+import time
+import os
+
+from log_symbols import LogSymbols
+from halo import Halo
+
+from .accounts import AccountManager
+from .binary_api import BINARY_API
+from .http_api import HTTP_APIv2
+from .scheduler import WalletScheduler, QueueFullError, DeadlineExceeded
+from .transaction import Transaction
+from .wallet_config import Config
+
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.epic', 'gateway.sock')
+DEFAULT_API_SECRET_PATH = os.path.join(os.path.expanduser('~'), '.epic', '.gateway_api_secret')
+
+
+def load_api_secret(api_secret_path: str, create: bool = False) -> str:
+    """Read gateway API secret (like owner_api .api_secret), optionally create new one"""
+    if create and not os.path.isfile(api_secret_path):
+        os.makedirs(os.path.dirname(api_secret_path) or '.', exist_ok=True)
+        fd = os.open(api_secret_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            file.write(secrets.token_urlsafe(32))
+    return open(api_secret_path).read().strip()
+
+
+class Coalescer:
+    """Share result of identical calls running at the same time instead of repeating them"""
+
+    def __init__(self):
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+        return future.result()
+
+
+class WalletSession:
+    """
+    Single owner_api process for one wallet, shared by all gateway clients.
+    Read calls are coalesced, all calls go through WalletScheduler: by priority,
+    reads concurrently, writes one at a time.
+    """
+    reads = ('get_balance', 'get_transactions', 'get_outputs', 'node_height', 'accounts',
+             'get_account_balances')
+    writes = ('send_transaction', 'cancel_transaction', 'issue_invoice', 'create_account')
+
+    def __init__(self, name: str, config_path: str, binary_path: str, password: str):
+        self.name = name
+        self.cfg = Config(config_path=config_path)
+        if not self.cfg.config_path:
+            raise ValueError(f"Wrong configuration file path: {config_path}")
+
+        self.binary = BINARY_API(settings=self.cfg.settings, binary_path=binary_path)
+        self.http = HTTP_APIv2(settings=self.cfg.settings)
+        # Shared spinners are not thread-safe, daemon doesn't need them
+        self.binary.spinner = Halo(enabled=False)
+        self.http.spinner = Halo(enabled=False)
+
+        self.account_manager = AccountManager(binary=self.binary, http=self.http)
+        self._password = password
+        self.owner_api = None
+        self.coalescer = Coalescer()
+        self.scheduler = WalletScheduler(http=self.http, binary=self.binary)
+
+    def start(self, timeout: int = 30):
+        """Start owner_api process and wait until it accepts connections"""
+        if not self.owner_api:
+            self.owner_api = self.binary.start_owner_api(password=self._password)
+            address = self.cfg.settings['wallet'].get('api_listen_interface', '127.0.0.1')
+            port = int(self.binary.owner_api_listen_port)
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                try:
+                    socket.create_connection((address, port), timeout=1).close()
+                    return self
+                except OSError:
+                    time.sleep(0.2)
+            print(f"{LogSymbols.WARNING.value} {self.name}: owner_api not responding on port {port}")
+        return self
+
+    def stop(self):
+        self.scheduler.shutdown()
+        if self.owner_api:
+            self.binary.stop_listener(self.owner_api)
+            self.owner_api = None
+
+    @staticmethod
+    def _ok(response):
+        if not response:
+            raise RuntimeError('owner_api call failed')
+        return response['result']['Ok']
+
+    def get_balance(self, minimum_confirmations: int = 10):
+        return self._ok(self.http.retrieve_summary_info(
+            minimum_confirmations=minimum_confirmations))[1]
+
+    def get_transactions(self, length: int = 100):
+        transactions = self._ok(self.http.retrieve_txs())[1]
+        transactions.reverse()
+        return transactions[:length]
+
+    def get_outputs(self, include_spent: bool = False):
+        return self._ok(self.http.retrieve_outputs(include_spent=include_spent))[1]
+
+    def node_height(self):
+        return self._ok(self.http.node_height())
+
+    def accounts(self):
+        return self.account_manager.accounts()
+
+    def get_account_balances(self, accounts: list = None):
+        return self.account_manager.summary_info(password=self._password, accounts=accounts)
+
+    def send_transaction(self, transaction: dict, account: str = None):
+        """
+        Send through session's owner_api (no extra CLI process opening the wallet):
+        init_send_tx -> tx_lock_outputs -> recipient's receive_tx -> finalize_tx -> post_tx.
+        'file' method writes locked slate to destination for recipient, like CLI does.
+        """
+        tx = Transaction(**transaction)
+        tx.created = tx.created if tx.created else time.strftime('%Y-%m-%dT%H:%M:%S')
+        if 'http' not in tx.method and 'file' not in tx.method:
+            raise ValueError(f"Method '{tx.method}' is not supported by gateway, use 'http' or 'file'")
+
+        slate = self._ok(self.http.init_send_tx(
+            src_acct_name=account, amount=int(Decimal(tx.amount) * 10 ** 8), message=tx.message,
+            selection_strategy_is_use_all=tx.strategy == 'all'))
+        self._ok(self.http.tx_lock_outputs(slate=slate))
+
+        if 'file' in tx.method:
+            tx.destination = os.path.abspath(tx.destination)
+            with open(tx.destination, 'w') as file:
+                json.dump(slate, file)
+        else:
+            try:
+                slate = self._ok(self.http.finalize_tx(
+                    slate=self._ok(self.http.receive_tx(slate=slate, dest=tx.destination))))
+            except RuntimeError:
+                # Unlock outputs of transaction which won't be finished
+                self.http.cancel_tx(tx_slate_id=slate['id'])
+                raise
+            self._ok(self.http.post_tx(tx=slate['tx']))
+
+        return {'destination': tx.destination, 'amount': tx.amount, 'method': tx.method,
+                'tx_slate_id': slate['id']}
+
+    def cancel_transaction(self, id: int = None, uuid: str = None):
+        return self._ok(self.http.cancel_tx(tx_id=id, tx_slate_id=uuid))
+
+    def issue_invoice(self, amount: int, message: str = None):
+        params = {'amount': amount}
+        if message:
+            params['message'] = message
+        return self._ok(self.http.issue_invoice_tx(**params))
+
+    def create_account(self, label: str):
+        path = self.account_manager.create_account_path(label=label)
+        if not path:
+            raise RuntimeError(f"Can't create account '{label}'")
+        return path
+
+    def call(self, method: str, params: dict):
+        if method in self.reads:
+            key = (method, json.dumps(params, sort_keys=True))
+            return self.coalescer.do(key, self.scheduler.run, getattr(self, method), **params)
+        if method in self.writes:
+            return self.scheduler.run(getattr(self, method), **params)
+        raise ValueError(f"Unknown method '{method}'")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    gateway = None
+
+    def _authorized(self) -> bool:
+        """HTTP Basic auth 'epic:<api secret>', same as owner_api"""
+        if self.gateway.api_secret is None:
+            return True
+        scheme, _, credentials = self.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'basic':
+            return False
+        try:
+            username, _, password = base64.b64decode(credentials).decode().partition(':')
+        except (binascii.Error, UnicodeDecodeError):
+            return False
+        return username == 'epic' and hmac.compare_digest(password, self.gateway.api_secret)
+
+    def _rejected(self) -> bool:
+        if not self._authorized():
+            self.send_response(401)
+            self.send_header('WWW-Authenticate', 'Basic realm="epic-wallet-gateway"')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return True
+        # Browsers always send Origin for cross-origin requests, local clients don't
+        if self.headers.get('Origin') is not None:
+            self._reply(403, {'error': 'Cross-origin requests are not allowed'})
+            return True
+        return False
+
+    def _reply(self, code: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self._rejected():
+            return
+        if self.path.rstrip('/') == '/wallets':
+            return self._reply(200, {'result': list(self.gateway.sessions.keys())})
+        if self.path.rstrip('/') == '/stats':
+            return self._reply(200, {'result': {name: session.scheduler.stats()
+                                                for name, session in self.gateway.sessions.items()}})
+        self._reply(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self._rejected():
+            return
+        if self.headers.get('Content-Type', '').split(';')[0].strip().lower() != 'application/json':
+            return self._reply(415, {'error': "Content-Type has to be 'application/json'"})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            result = self.gateway.call(wallet=request['wallet'], method=request['method'],
+                                       params=request.get('params', {}))
+        except (KeyError, ValueError, TypeError) as e:
+            return self._reply(400, {'error': str(e)})
+        except (QueueFullError, DeadlineExceeded) as e:
+            return self._reply(503, {'error': str(e)})
+        except Exception as e:
+            return self._reply(500, {'error': str(e)})
+        self._reply(200, {'result': result})
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnixHTTPServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class WalletGateway:
+    """
+    Long-running local daemon owning one WalletSession per wallet, serves
+    JSON requests {"wallet": name, "method": "get_balance", "params": {}}
+    over Unix socket (default, owner only) or local HTTP when :param port: is given.
+    HTTP requests need Basic auth 'epic:<secret from api_secret_path>', secret
+    file is created if it doesn't exist.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, host: str = '127.0.0.1',
+                 port: int = None, api_secret_path: str = None):
+        self.host = host
+        self.port = port
+        self.socket_path = None if port is not None else socket_path
+        self.api_secret = None
+        if api_secret_path or port is not None:
+            self.api_secret = load_api_secret(api_secret_path or DEFAULT_API_SECRET_PATH, create=True)
+        self.sessions = {}
+        self.server = None
+
+    def add_wallet(self, name: str, config_path: str, binary_path: str, password: str):
+        session = WalletSession(name=name, config_path=config_path,
+                                binary_path=binary_path, password=password)
+        self.sessions[name] = session.start()
+        return session
+
+    def call(self, wallet: str, method: str, params: dict):
+        if wallet not in self.sessions:
+            raise KeyError(f"Unknown wallet '{wallet}'")
+        return self.sessions[wallet].call(method, params)
+
+    def serve_forever(self):
+        handler = type('Handler', (_Handler,), {'gateway': self})
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+            # Socket is created owner-only, other local users can't connect
+            umask = os.umask(0o177)
+            try:
+                self.server = _UnixHTTPServer(self.socket_path, handler)
+            finally:
+                os.umask(umask)
+            where = self.socket_path
+        else:
+            self.server = ThreadingHTTPServer((self.host, self.port), handler)
+            self.server.daemon_threads = True
+            where = f"http://{self.host}:{self.server.server_address[1]}"
+
+        print(f"{LogSymbols.SUCCESS.value} Wallet gateway listening on {where} "
+              f"({', '.join(self.sessions.keys())})")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        for session in self.sessions.values():
+            session.stop()
+        if self.server:
+            self.server.server_close()
+            self.server = None
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: int = 600):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class GatewayClient:
+    """Client for WalletGateway, same method names as Wallet"""
+
+    def __init__(self, wallet: str, socket_path: str = DEFAULT_SOCKET_PATH, host: str = '127.0.0.1',
+                 port: int = None, api_secret_path: str = None, timeout: int = 600):
+        self.wallet = wallet
+        self.host = host
+        self.port = port
+        self.socket_path = None if port is not None else socket_path
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json'}
+        if api_secret_path or port is not None:
+            secret = load_api_secret(api_secret_path or DEFAULT_API_SECRET_PATH)
+            token = base64.b64encode(f"epic:{secret}".encode()).decode()
+            self.headers['Authorization'] = f"Basic {token}"
+
+    def _connection(self):
+        if self.socket_path:
+            return _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def call(self, method: str, **params):
+        connection = self._connection()
+        try:
+            body = json.dumps({'wallet': self.wallet, 'method': method, 'params': params})
+            connection.request('POST', '/', body=body, headers=self.headers)
+            reply = connection.getresponse()
+            payload = reply.read()
+        finally:
+            connection.close()
+
+        response = json.loads(payload) if payload else {'error': f"HTTP {reply.status} {reply.reason}"}
+
+        if 'error' in response:
+            print(f"{LogSymbols.ERROR.value} Gateway: {method} ERROR: {response['error']}")
+            return False
+        return response['result']
+
+    def __getattr__(self, method: str):
+        if method in WalletSession.reads or method in WalletSession.writes:
+            return lambda **params: self.call(method, **params)
+        raise AttributeError(method)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local epic-wallet gateway daemon')
+    parser.add_argument('--wallet', action='append', required=True, metavar='NAME=CONFIG_PATH',
+                        help='wallet name and path to its epic-wallet.toml, can be repeated')
+    parser.add_argument('--binary-path', required=True, help='directory with epic-wallet binary')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help='Unix socket path (default transport)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='serve on local HTTP port instead of Unix socket')
+    parser.add_argument('--api-secret-path', help=f"HTTP Basic auth secret (default {DEFAULT_API_SECRET_PATH})")
+    args = parser.parse_args()
+
+    gateway = WalletGateway(socket_path=args.socket, host=args.host, port=args.port,
+                            api_secret_path=args.api_secret_path)
+    for wallet in args.wallet:
+        name, config_path = wallet.split('=', 1)
+        password = os.environ.get(f"EPIC_WALLET_PASSWORD_{name.upper()}") \
+            or getpass.getpass(f"Password for wallet '{name}': ")
+        gateway.add_wallet(name=name, config_path=config_path,
+                           binary_path=args.binary_path, password=password)
+
+    try:
+        gateway.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{LogSymbols.INFO.value} Wallet gateway stopped")
+
+
+if __name__ == '__main__':
+    main()
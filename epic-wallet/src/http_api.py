@@ -1,3 +1,4 @@
+from urllib.parse import urlsplit
 from typing import Union
 
 from requests.auth import HTTPBasicAuth
@@ -32,7 +33,24 @@ class HTTP_APIv2:
 
         # Prepare auth for API POST call
         auth = HTTPBasicAuth(username=username, password=password)
+        return self._api_call(url, auth, method, params, address, port)
 
+    def _foreign_api_call(self, method: str, params: Union[dict, list]):
+        """Base function to make foreign_api (wallet listener) POST calls"""
+        self.spinner.start(text=f"HTTPAPIv2: call {method} ...")
+
+        # Foreign API is protected only if foreign_api_secret_path is set
+        auth = None
+        secret_path = self.settings['wallet'].get('foreign_api_secret_path')
+        if secret_path:
+            auth = HTTPBasicAuth(username='epic', password=open(secret_path).read().strip())
+        address = self.settings['wallet']['api_listen_interface']
+        port = self.settings['wallet']['api_listen_port']
+        url = f"http://{address}:{port}/v2/foreign"
+        return self._api_call(url, auth, method, params, address, port)
+
+    def _api_call(self, url: str, auth, method: str, params: Union[dict, list], address: str, port):
+        """Make JSON-RPC POST call, handle errors returned by wallet API"""
         # Prepare JSON payload for API POST call
         json = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
         try:
@@ -113,11 +131,57 @@ class HTTP_APIv2:
         params = self._update_params(default, params)
         return self._owner_api_call(method=end_point, params=params)
 
-    def init_send_tx(self):
-        pass
+    def init_send_tx(self, **params):
+        end_point = 'init_send_tx'
+        default = dict(api_calls_args.tx_args)
+        args = self._update_params(default, params)
+        return self._owner_api_call(method=end_point, params={'args': args})
+
+    def issue_invoice_tx(self, **params):
+        end_point = 'issue_invoice_tx'
+        default = dict(api_calls_args.invoice_args)
+        args = self._update_params(default, params)
+        return self._owner_api_call(method=end_point, params={'args': args})
+
+    def process_invoice_tx(self, slate: dict, **params):
+        end_point = 'process_invoice_tx'
+        default = dict(api_calls_args.tx_args)
+        args = self._update_params(default, params)
+        return self._owner_api_call(method=end_point, params={'slate': slate, 'args': args})
+
+    def tx_lock_outputs(self, slate: dict, participant_id: int = 0):
+        end_point = 'tx_lock_outputs'
+        params = {'slate': slate, 'participant_id': participant_id}
+        return self._owner_api_call(method=end_point, params=params)
+
+    def finalize_tx(self, slate: dict):
+        end_point = 'finalize_tx'
+        return self._owner_api_call(method=end_point, params={'slate': slate})
+
+    def post_tx(self, tx: dict, fluff: bool = False):
+        end_point = 'post_tx'
+        return self._owner_api_call(method=end_point, params={'tx': tx, 'fluff': fluff})
+
+    def finalize_invoice_tx(self, slate: dict):
+        """Foreign API: issuer finalizes invoice slate processed by the payer"""
+        end_point = 'finalize_invoice_tx'
+        return self._foreign_api_call(method=end_point, params=[slate])
 
-    def issue_invoice_tx(self):
-        pass
+    def receive_tx(self, slate: dict, dest: str):
+        """Recipient's foreign API (e.g. http://host:3415): add recipient's part to sent slate"""
+        self.spinner.start(text=f"HTTPAPIv2: call receive_tx ...")
+        url = urlsplit(dest)
+        return self._api_call(f"{dest.rstrip('/')}/v2/foreign", None, 'receive_tx',
+                              [slate, None, None], url.hostname, url.port)
+
+    def cancel_tx(self, **params):
+        end_point = 'cancel_tx'
+        default = {
+            "tx_id": None,
+            "tx_slate_id": None
+            }
+        params = self._update_params(default, params)
+        return self._owner_api_call(method=end_point, params=params)
 
     def node_height(self, **params):
         end_point = 'node_height'
@@ -0,0 +1,216 @@
+from collections import deque
+import threading
+import time
+
+from log_symbols import LogSymbols
+
+from .http_api import HTTP_APIv2
+
+
+class Invoice:
+    """
+    // Invoice slate issued by the wallet //
+    :param slate: DICT, invoice slate returned by owner_api issue_invoice_tx
+    :param amount: INT, invoice value in base units (1 EPIC = 10**8)
+    :param created: FLOAT, time.time() of issuing
+    """
+
+    def __init__(self, slate: dict, amount: int, created: float = None):
+        self.slate = slate
+        self.amount = amount
+        self.slate_id = slate['id']
+        self.created = created if created else time.time()
+        self.handed_out = None
+        self.settled = None
+        self.status = 'pooled'  # pooled -> issued -> paid / expired
+
+    def age(self, now: float = None) -> float:
+        return (now if now else time.time()) - self.created
+
+
+class InvoicePool:
+    """
+    Keep ready-to-use invoice slates for common amounts, so checkout doesn't wait
+    for owner_api. Background thread refills the pool, tracks paid invoices via
+    wallet tx log and cancels stale ones. Owner API has to be running.
+
+    :param http: HTTP_APIv2, owner_api client
+    :param amounts: list, invoice amounts in base units kept in pool
+    :param size: int, number of pre-generated invoices per amount
+    :param ttl: int, seconds after which not paid invoice is cancelled
+    :param interval: int, seconds between background refill/tracking runs
+    :param on_paid: callable(Invoice), called once invoice is paid
+    """
+
+    def __init__(self, http: HTTP_APIv2, amounts: list, size: int = 5, ttl: int = 3600,
+                 interval: int = 10, message: str = None, on_paid=None):
+        self.http = http
+        self.size = size
+        self.ttl = ttl
+        self.interval = interval
+        self.message = message
+        self.on_paid = on_paid
+
+        self._ready = {int(amount): deque() for amount in amounts}
+        self._issued = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = threading.Event()
+        self._thread = None
+
+    def _issue(self, amount: int):
+        params = {'amount': amount}
+        if self.message:
+            params['message'] = self.message
+
+        response = self.http.issue_invoice_tx(**params)
+        if response:
+            return Invoice(slate=response['result']['Ok'], amount=amount)
+
+    def get(self, amount: int):
+        """Hand out invoice for given amount, issue new one if pool is empty"""
+        amount = int(amount)
+        with self._lock:
+            ready = self._ready.get(amount)
+            invoice = ready.popleft() if ready else None
+
+        if not invoice:
+            invoice = self._issue(amount)
+            if not invoice:
+                return None
+
+        invoice.status = 'issued'
+        invoice.handed_out = time.time()
+        with self._lock:
+            self._issued[invoice.slate_id] = invoice
+
+        self._wakeup.set()
+        return invoice
+
+    def status(self, slate_id: str):
+        with self._lock:
+            invoice = self._issued.get(slate_id)
+        return invoice.status if invoice else None
+
+    def available(self) -> dict:
+        """Number of ready invoices per amount"""
+        with self._lock:
+            return {amount: len(ready) for amount, ready in self._ready.items()}
+
+    def refill(self) -> int:
+        """Issue invoices until every amount has :param size: ready, return number issued"""
+        issued = 0
+        for amount, ready in self._ready.items():
+            while len(ready) < self.size:
+                if self._thread and not self._running.is_set():
+                    return issued
+                invoice = self._issue(amount)
+                if not invoice:
+                    return issued
+                with self._lock:
+                    ready.append(invoice)
+                issued += 1
+        return issued
+
+    def finalize(self, slate: dict, post: bool = True):
+        """Finalize invoice slate returned by payer and post transaction to the node"""
+        response = self.http.finalize_invoice_tx(slate=slate)
+        if response and post:
+            if not self.http.post_tx(tx=response['result']['Ok']['tx']):
+                return False
+        return response
+
+    def check_paid(self, refresh_from_node: bool = True) -> list:
+        """Match handed out invoices against wallet tx log, return newly paid invoices"""
+        with self._lock:
+            pending = {id_: inv for id_, inv in self._issued.items() if inv.status == 'issued'}
+        if not pending:
+            return []
+
+        response = self.http.retrieve_txs(refresh_from_node=refresh_from_node)
+        if not response:
+            return []
+
+        paid = []
+        for tx in response['result']['Ok'][1]:
+            invoice = pending.get(tx.get('tx_slate_id'))
+            if invoice and tx.get('confirmed'):
+                invoice.status = 'paid'
+                invoice.settled = time.time()
+                paid.append(invoice)
+
+        for invoice in paid:
+            if self.on_paid:
+                self.on_paid(invoice)
+        return paid
+
+    def _finalized(self, invoice: Invoice) -> bool:
+        """Payment for invoice was finalized (tx has kernel) or confirmed, only waits for the chain"""
+        response = self.http.retrieve_txs(tx_slate_id=invoice.slate_id, refresh_from_node=False)
+        if not response:
+            # State unknown, don't cancel what may be already paid
+            return True
+        return any(tx.get('confirmed') or tx.get('kernel_excess') for tx in response['result']['Ok'][1])
+
+    def expire(self) -> list:
+        """
+        Cancel invoices older than ttl (pooled, and issued ones still not finalized),
+        return expired invoices
+        """
+        now = time.time()
+        expired, overdue = [], []
+        with self._lock:
+            for ready in self._ready.values():
+                while ready and ready[0].age(now) > self.ttl:
+                    expired.append(ready.popleft())
+            for slate_id, invoice in list(self._issued.items()):
+                # Checkout gets full ttl to collect payment, time spent in the pool doesn't count
+                if invoice.status == 'issued' and now - invoice.handed_out > self.ttl:
+                    overdue.append(invoice)
+                # Forget settled invoices after another ttl period
+                elif invoice.settled and now - invoice.settled > self.ttl:
+                    self._issued.pop(slate_id)
+
+        # Finalized and posted invoices stay issued until check_paid sees them confirmed
+        expired += [invoice for invoice in overdue if not self._finalized(invoice)]
+        for invoice in expired:
+            invoice.status = 'expired'
+            invoice.settled = now
+            self.http.cancel_tx(tx_slate_id=invoice.slate_id)
+        return expired
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                # Paid invoices first, so they aren't cancelled as expired
+                self.check_paid()
+                self.expire()
+                self.refill()
+            except Exception as e:
+                print(f"{LogSymbols.ERROR.value} InvoicePool: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def start(self):
+        """Start background refill/tracking thread"""
+        if not self._thread:
+            self._running.set()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, cancel_pooled: bool = False):
+        """Stop background thread, optionally cancel invoices never handed out"""
+        self._running.clear()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        if cancel_pooled:
+            with self._lock:
+                pooled = [invoice for ready in self._ready.values() for invoice in ready]
+                for ready in self._ready.values():
+                    ready.clear()
+            for invoice in pooled:
+                self.http.cancel_tx(tx_slate_id=invoice.slate_id)
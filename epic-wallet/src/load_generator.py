@@ -0,0 +1,415 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Union
+import threading
+import argparse
+import tempfile
+import random
+import uuid
+import math
+import queue
+import json
+import time
+import os
+
+from log_symbols import LogSymbols
+from halo import Halo
+
+from .http_api import HTTP_APIv2
+
+
+DEFAULT_MIX = {
+    'retrieve_summary_info': 0.6,
+    'retrieve_txs': 0.3,
+    'send_transaction': 0.1,
+    }
+
+
+def percentile(values: list, pct: float):
+    """Nearest-rank percentile of given values, None for empty list"""
+    if not values:
+        return None
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class MockOwnerAPI:
+    """
+    Local owner_api v2 imitation for load tests, answers JSON-RPC calls with
+    canned responses. :param latency: seconds spent on each call, :param workers:
+    number of calls served at once (emulates wallet database lock).
+    """
+    summary = {
+        "last_confirmed_height": 1_000_000,
+        "minimum_confirmations": 10,
+        "total": 1_000_000_000,
+        "amount_awaiting_finalization": 0,
+        "amount_awaiting_confirmation": 0,
+        "amount_immature": 0,
+        "amount_currently_spendable": 1_000_000_000,
+        "amount_locked": 0,
+        }
+
+    def __init__(self, address: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.01, workers: int = 1, txs: int = 100):
+        self.latency = latency
+        self.lock = threading.BoundedSemaphore(workers)
+        self.txs = [self._tx(i) for i in range(txs)]
+        self.server = ThreadingHTTPServer((address, port), self._handler())
+        self.server.daemon_threads = True
+        self.address, self.port = self.server.server_address[:2]
+        self._secret = tempfile.NamedTemporaryFile('w', suffix='.api_secret', delete=False)
+        self._secret.write('mock')
+        self._secret.close()
+        self._thread = None
+
+    @staticmethod
+    def _tx(id_: int):
+        return {"id": id_, "tx_type": "TxReceived", "confirmed": True,
+                "amount_credited": "10000000", "amount_debited": "0", "fee": None,
+                "tx_slate_id": f"00000000-0000-0000-0000-{id_:012d}",
+                "creation_ts": "2021-08-01T00:00:00Z",
+                "confirmation_ts": "2021-08-01T00:01:00Z"}
+
+    def _result(self, method: str, params: dict):
+        if method == 'retrieve_summary_info':
+            return [True, self.summary]
+        if method == 'retrieve_txs':
+            return [True, [tx for tx in self.txs if params.get('tx_id') in (None, tx['id'])
+                           and params.get('tx_slate_id') in (None, tx['tx_slate_id'])]]
+        if method == 'retrieve_outputs':
+            tx_ids = [tx['id'] for tx in self.txs if params.get('tx_id') in (None, tx['id'])]
+            return [True, [{"commit": f"{tx_id:066x}",
+                            "output": {"height": str(1000 + tx_id), "tx_log_entry": tx_id}}
+                           for tx_id in tx_ids]]
+        if method in ('init_send_tx', 'issue_invoice_tx'):
+            return {"version_info": {"version": 2, "orig_version": 2}, "id": str(uuid.uuid4()),
+                    "num_participants": 2, "amount": str(params['args']['amount'])}
+        if method == 'receive_tx':
+            return params[0]
+        if method in ('finalize_tx', 'finalize_invoice_tx'):
+            return dict(params['slate'] if isinstance(params, dict) else params[0], tx={"body": {}})
+        if method in ('tx_lock_outputs', 'post_tx', 'cancel_tx'):
+            return None
+        if method == 'node_height':
+            return {"height": str(self.summary['last_confirmed_height']), "updated_from_node": True}
+        raise KeyError(method)
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                call = json.loads(body)
+                with mock.lock:
+                    time.sleep(mock.latency)
+                    try:
+                        response = {"jsonrpc": "2.0", "id": call['id'],
+                                    "result": {"Ok": mock._result(call['method'], call['params'])}}
+                    except KeyError:
+                        response = {"jsonrpc": "2.0", "id": call['id'],
+                                    "error": {"code": -32601, "message": "Method not found"}}
+
+                payload = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    @property
+    def settings(self) -> dict:
+        """Settings dict usable by HTTP_APIv2 to call this mock"""
+        return {'wallet': {'api_secret_path': self._secret.name,
+                           'api_listen_interface': self.address,
+                           'owner_api_listen_port': self.port,
+                           'api_listen_port': self.port}}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        try: os.remove(self._secret.name)
+        except OSError: pass
+
+
+class LoadGenerator:
+    """
+    Replay mix of owner_api calls at target rate (open loop) and measure how the
+    wallet copes. Requests are scheduled by the clock, not by responses, so once
+    the wallet saturates the queue depth and latency percentiles start to grow.
+
+    :param settings: dict, wallet settings (epic-wallet.toml) or MockOwnerAPI.settings
+    :param mix: dict, {call_name: weight}, calls: retrieve_summary_info, retrieve_txs, send_transaction
+    :param workers: int, number of concurrent clients
+    :param window: float, seconds per report window
+    """
+    calls = ('retrieve_summary_info', 'retrieve_txs', 'send_transaction')
+
+    def __init__(self, settings: dict, mix: dict = None, workers: int = 8,
+                 window: float = 1.0, send_args: dict = None):
+        self.settings = settings
+        self.mix = mix if mix else dict(DEFAULT_MIX)
+        self.workers = workers
+        self.window = window
+        self.send_args = send_args if send_args else {}
+
+        for call in self.mix.keys():
+            if call not in self.calls:
+                raise ValueError(f"Unknown call '{call}', use one of {self.calls}")
+
+        self._queue = queue.Queue()
+        self._samples = []
+        self._depth = []
+        self._lock = threading.Lock()
+
+    def _client(self) -> HTTP_APIv2:
+        client = HTTP_APIv2(settings=self.settings)
+        client.spinner = Halo(enabled=False)
+        return client
+
+    @staticmethod
+    def _call(client: HTTP_APIv2, method: str, params: dict):
+        if method == 'send_transaction':
+            return client.init_send_tx(**params)
+        return getattr(client, method)(**params)
+
+    def _worker(self):
+        client = self._client()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            scheduled, method, params = job
+            started = time.perf_counter()
+            try:
+                ok = bool(self._call(client, method, params))
+            except Exception:
+                ok = False
+            finished = time.perf_counter()
+            with self._lock:
+                self._samples.append((scheduled, started, finished, method, ok))
+
+    def _plan(self, rate: float, duration: float):
+        """Yield (offset, method, params) for weighted random mix at given rate"""
+        methods = list(self.mix.keys())
+        weights = list(self.mix.values())
+        for i in range(int(rate * duration)):
+            method = random.choices(methods, weights)[0]
+            params = dict(self.send_args) if method == 'send_transaction' else {}
+            yield i / rate, method, params
+
+    @staticmethod
+    def load_recording(file_path: str):
+        """
+        Read recorded traffic file, one JSON object per line:
+        {"ts": seconds since start, "method": "retrieve_txs", "params": {...}}
+        """
+        with open(file_path) as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    yield float(record['ts']), record['method'], record.get('params', {})
+
+    def _execute(self, plan):
+        self._samples = []
+        self._depth = []
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        start = time.perf_counter()
+        next_sample = 0.0
+        for offset, method, params in plan:
+            while True:
+                now = time.perf_counter() - start
+                if now >= next_sample:
+                    self._depth.append((next_sample, self._queue.qsize()))
+                    next_sample += self.window / 4
+                if now >= offset:
+                    break
+                time.sleep(min(offset - now, self.window / 4))
+            self._queue.put((start + offset, method, params))
+
+        # Keep sampling queue depth while backlog is drained
+        while not self._queue.empty():
+            self._depth.append((time.perf_counter() - start, self._queue.qsize()))
+            time.sleep(self.window / 4)
+
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+        return self.report(start)
+
+    def run(self, rate: float, duration: float = 10.0) -> dict:
+        """Generate traffic at :param rate: calls/second for :param duration: seconds"""
+        return self._execute(self._plan(rate, duration))
+
+    def replay(self, file_path: str, speed: float = 1.0) -> dict:
+        """Replay recorded traffic file, :param speed: time multiplier (2.0 = twice as fast)"""
+        plan = ((ts / speed, method, params) for ts, method, params in self.load_recording(file_path))
+        return self._execute(plan)
+
+    def ramp(self, rates: list, duration: float = 10.0) -> dict:
+        """Run one step per rate, return saturation point (first step that could not keep up)"""
+        steps = []
+        for rate in rates:
+            result = self.run(rate=rate, duration=duration)
+            result['requested_rate'] = rate
+            steps.append(result)
+            print(f"{LogSymbols.INFO.value} target: {rate}/s, "
+                  f"throughput: {result['throughput']:.2f}/s, "
+                  f"p99: {self._ms(result['latency']['p99'])}, "
+                  f"max queue: {result['max_queue_depth']}")
+            if result['saturated']:
+                break
+
+        saturated = [step for step in steps if step['saturated']]
+        return {'steps': steps,
+                'saturation_rate': saturated[0]['requested_rate'] if saturated else None,
+                'max_throughput': max(step['throughput'] for step in steps) if steps else 0}
+
+    @staticmethod
+    def _latency(samples: list) -> dict:
+        latency = [finished - scheduled for scheduled, started, finished, method, ok in samples]
+        return {'p50': percentile(latency, 50),
+                'p90': percentile(latency, 90),
+                'p99': percentile(latency, 99),
+                'max': max(latency) if latency else None}
+
+    def report(self, start: float) -> dict:
+        """Summarize samples: totals, latency percentiles, per-window timeline, saturation"""
+        samples = sorted(self._samples)
+        if not samples:
+            return {'requests': 0, 'errors': 0, 'target_rate': 0, 'throughput': 0,
+                    'latency': self._latency([]), 'max_queue_depth': 0,
+                    'timeline': [], 'saturated': False, 'saturated_at': None}
+
+        finished = sorted(s[2] for s in samples)
+        finished_span = max(finished[-1] - start, self.window)
+        # Rates between first and last request, so constant latency doesn't lower throughput
+        offered_span = samples[-1][0] - samples[0][0]
+        completed_span = finished[-1] - finished[0]
+        target_rate = (len(samples) - 1) / offered_span if offered_span > 0 else float(len(samples))
+        throughput = (len(samples) - 1) / completed_span if completed_span > 0 else target_rate
+
+        timeline = []
+        windows = int(finished_span // self.window) + 1
+        for i in range(windows):
+            low, high = start + i * self.window, start + (i + 1) * self.window
+            done = [s for s in samples if low <= s[2] < high]
+            depth = [d for t, d in self._depth if low - start <= t < high - start]
+            timeline.append({
+                'time': round(i * self.window, 3),
+                'offered': len([s for s in samples if low <= s[0] < high]),
+                'completed': len(done),
+                'errors': len([s for s in done if not s[4]]),
+                'queue_depth': max(depth) if depth else 0,
+                'service_p50': percentile([s[2] - s[1] for s in done], 50),
+                'latency': self._latency(done),
+                })
+
+        # Saturated: backlog keeps growing, latency keeps growing or throughput can't follow offered load
+        saturated_at = None
+        for prev, window in zip(timeline, timeline[1:]):
+            if window['queue_depth'] > prev['queue_depth'] > self.workers:
+                saturated_at = window['time']
+                break
+
+        quarter = max(1, len(samples) // 4)
+        early = percentile([s[2] - s[0] for s in samples[:quarter]], 50)
+        late = percentile([s[2] - s[0] for s in samples[-quarter:]], 50)
+        latency_growing = late > 2 * early and late - early > self.window
+
+        return {
+            'requests': len(samples),
+            'errors': len([s for s in samples if not s[4]]),
+            'target_rate': target_rate,
+            'throughput': throughput,
+            'latency': self._latency(samples),
+            'by_call': {method: self._latency([s for s in samples if s[3] == method])
+                        for method in set(s[3] for s in samples)},
+            'max_queue_depth': max(d for t, d in self._depth) if self._depth else 0,
+            'timeline': timeline,
+            'saturated': saturated_at is not None or latency_growing or throughput < target_rate * 0.9,
+            'saturated_at': saturated_at,
+            }
+
+    @staticmethod
+    def _ms(value: Union[float, None]):
+        return f"{value * 1000:.1f}ms" if value is not None else '-'
+
+    def print_report(self, report: dict):
+        print(f"\n----- LOAD REPORT -----\n"
+              f"REQUESTS: {report['requests']} (errors: {report['errors']})\n"
+              f"TARGET RATE: {report['target_rate']:.2f}/s\n"
+              f"THROUGHPUT: {report['throughput']:.2f}/s\n"
+              f"LATENCY p50/p90/p99: {self._ms(report['latency']['p50'])} / "
+              f"{self._ms(report['latency']['p90'])} / {self._ms(report['latency']['p99'])}\n"
+              f"MAX QUEUE DEPTH: {report['max_queue_depth']}")
+        print(f"\n{'TIME':>6} {'OFFERED':>8} {'DONE':>6} {'ERR':>4} {'QUEUE':>6} {'p50':>10} {'p99':>10}")
+        for w in report['timeline']:
+            print(f"{w['time']:>6} {w['offered']:>8} {w['completed']:>6} {w['errors']:>4} "
+                  f"{w['queue_depth']:>6} {self._ms(w['latency']['p50']):>10} {self._ms(w['latency']['p99']):>10}")
+
+        if report['saturated']:
+            print(f"\n{LogSymbols.WARNING.value} Wallet saturated"
+                  f"{' at ' + str(report['saturated_at']) + 's' if report['saturated_at'] is not None else ''}")
+        else:
+            print(f"\n{LogSymbols.SUCCESS.value} Wallet kept up with offered load")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Owner API load generator')
+    parser.add_argument('--config', help='path to epic-wallet.toml, owner_api must be running')
+    parser.add_argument('--mock', action='store_true', help='run against local mock owner_api')
+    parser.add_argument('--mock-latency', type=float, default=0.01)
+    parser.add_argument('--recording', help='recorded traffic file (JSON lines) to replay')
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--rate', type=float, nargs='+', default=[10.0], help='calls/second, many values = ramp')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--window', type=float, default=1.0)
+    parser.add_argument('--mix', type=json.loads, default=None, help='JSON dict {call: weight}')
+    args = parser.parse_args()
+
+    mock = None
+    if args.mock:
+        mock = MockOwnerAPI(latency=args.mock_latency).start()
+        settings = mock.settings
+    elif args.config:
+        from .wallet_config import Config
+        settings = Config(config_path=args.config).settings
+    else:
+        parser.error('provide --config or --mock')
+
+    generator = LoadGenerator(settings=settings, mix=args.mix,
+                              workers=args.workers, window=args.window)
+    try:
+        if args.recording:
+            generator.print_report(generator.replay(args.recording, speed=args.speed))
+        elif len(args.rate) > 1:
+            result = generator.ramp(args.rate, duration=args.duration)
+            print(f"\n{LogSymbols.INFO.value} max throughput: {result['max_throughput']:.2f}/s, "
+                  f"saturation at: {result['saturation_rate']}")
+        else:
+            generator.print_report(generator.run(rate=args.rate[0], duration=args.duration))
+    finally:
+        if mock:
+            mock.stop()
+
+
+if __name__ == '__main__':
+    main()
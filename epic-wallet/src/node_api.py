@@ -0,0 +1,130 @@
+from typing import Union
+import threading
+import time
+
+from requests.auth import HTTPBasicAuth
+from log_symbols import LogSymbols
+import requests
+
+
+class NodeAPI:
+    """
+    Lightweight client for epic node API (v1), talks to the node directly so chain
+    height is available without running wallet owner_api. Chain tip is cached and
+    refreshed at most once per block interval. Use NodeAPI.shared(address) to get
+    one instance per node address shared by all Wallet instances.
+    """
+    block_interval = 60  # seconds, Epic-Cash target block time
+    retry_interval = 10  # seconds between tip requests while node is not responding
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, address: str, api_secret_path: str = None, timeout: int = 10):
+        self.address = address.rstrip('/')
+        self.api_secret_path = api_secret_path
+        self.timeout = timeout
+
+        self._tip = None
+        self._tip_time = 0.0
+        self._next_fetch = 0.0
+        self._tip_lock = threading.Lock()
+        self._session = requests.Session()
+
+        if self.api_secret_path:
+            password = open(self.api_secret_path).read().strip()
+            self._session.auth = HTTPBasicAuth(username='epic', password=password)
+
+    @classmethod
+    def shared(cls, address: str, api_secret_path: str = None):
+        """Return NodeAPI instance for given node address and API secret, create it on first use"""
+        key = (address.rstrip('/'), api_secret_path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(address, api_secret_path=api_secret_path)
+        return cls._instances[key]
+
+    def _get(self, path: str, params: dict = None, timeout: float = None):
+        """Base function to make node API GET calls"""
+        url = f"{self.address}{path}"
+        try:
+            response = self._session.get(url, params=params,
+                                         timeout=timeout if timeout else self.timeout)
+        except requests.exceptions.RequestException:
+            print(f"{LogSymbols.ERROR.value} NodeAPI: {self.address} is not responding")
+            return False
+
+        if response.status_code == 404:
+            return None
+
+        if not response.ok:
+            print(f"{LogSymbols.ERROR.value} NodeAPI: {path} ERROR [CODE: {response.status_code}]: "
+                  f"{response.text.strip()}")
+            return False
+
+        return response.json()
+
+    def get_tip(self, refresh: bool = False) -> Union[dict, bool]:
+        """
+        Return chain tip: {height, last_block_pushed, prev_block_to_last, total_difficulty}.
+        Cached value is used if younger than block interval, stale value is returned
+        when node is not responding (retried every retry_interval) or while other
+        thread is already refreshing it.
+        """
+        if not refresh and time.time() < self._next_fetch:
+            return self._tip if self._tip else False
+
+        if not self._tip_lock.acquire(blocking=not self._tip):
+            return self._tip
+        try:
+            if refresh or time.time() >= self._next_fetch:
+                self._fetch_tip()
+            return self._tip if self._tip else False
+        finally:
+            self._tip_lock.release()
+
+    def _fetch_tip(self, timeout: float = None):
+        tip = self._get('/v1/chain', timeout=timeout)
+        now = time.time()
+        if tip:
+            self._tip = tip
+            self._tip_time = now
+            self._next_fetch = now + self.block_interval
+        else:
+            self._next_fetch = now + min(self.retry_interval, self.block_interval)
+        return tip
+
+    def fetch_tip(self, timeout: float = None) -> Union[dict, bool]:
+        """Query chain tip from the node, bypass cache (update it on success)"""
+        with self._tip_lock:
+            return self._fetch_tip(timeout=timeout)
+
+    def height(self, refresh: bool = False) -> Union[int, bool]:
+        tip = self.get_tip(refresh=refresh)
+        return int(tip['height']) if tip else False
+
+    def confirmations(self, height: Union[int, str]) -> int:
+        """Number of confirmations for block at given height (0 if not confirmed yet)"""
+        tip_height = self.height()
+        if not tip_height or not height:
+            return 0
+        return max(0, tip_height - int(height) + 1)
+
+    def get_kernel(self, excess: str, min_height: int = None, max_height: int = None):
+        """Return kernel with given excess commitment and height of block it is included in"""
+        params = {}
+        if min_height is not None:
+            params['min_height'] = min_height
+        if max_height is not None:
+            params['max_height'] = max_height
+        return self._get(f'/v1/chain/kernels/{excess}', params=params)
+
+    def get_outputs(self, commits: list, include_proof: bool = False):
+        """Return unspent outputs for given list of commitments"""
+        params = {'id': ','.join(commits)}
+        if include_proof:
+            params['include_proof'] = 'true'
+        return self._get('/v1/chain/outputs/byids', params=params)
+
+    def get_block(self, height: int = None, hash_: str = None):
+        """Return block by height or hash"""
+        return self._get(f'/v1/blocks/{hash_ if hash_ else height}')
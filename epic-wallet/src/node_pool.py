@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from .node_api import NodeAPI
+
+
+class NodeState:
+    """Health and latency of single node known to NodePool"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.latency = None  # seconds, exponential moving average
+        self.height = 0
+        self.healthy = True
+        self.failures = 0
+        self.last_probe = 0.0
+
+    def __repr__(self):
+        latency = f"{self.latency * 1000:.0f}ms" if self.latency is not None else '-'
+        return f"NodeState({self.address}, healthy={self.healthy}, height={self.height}, latency={latency})"
+
+
+class NodePool:
+    """
+    Set of epic node addresses probed in background for latency and health.
+    Commands use the fastest healthy node at (or max_lag blocks behind) the best
+    known tip, the rest of the nodes are failover candidates.
+
+    :param addresses: list, node API addresses, first one is preferred until probed
+    :param interval: int, seconds between background probes
+    :param max_lag: int, blocks node can be behind the best tip and still be used
+    :param timeout: int, seconds to wait for node response during probe
+    :param api_secret_paths: dict, {address: path to node API secret} for protected nodes
+    """
+
+    def __init__(self, addresses: list, interval: int = 30, max_lag: int = 2, timeout: int = 5,
+                 api_secret_paths: dict = None):
+        if not addresses:
+            raise ValueError('NodePool needs at least one node address')
+
+        self.interval = interval
+        self.max_lag = max_lag
+        self.timeout = timeout
+        self.api_secret_paths = api_secret_paths if api_secret_paths else {}
+        self.nodes = {address: NodeState(address) for address in dict.fromkeys(addresses)}
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def probe(self, address: str) -> NodeState:
+        """Measure node response time and chain height"""
+        node = NodeAPI.shared(address, api_secret_path=self.api_secret_paths.get(address))
+        start = time.perf_counter()
+        tip = node.fetch_tip(timeout=self.timeout)
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            state = self.nodes[address]
+            state.last_probe = time.time()
+            if tip:
+                state.latency = latency if state.latency is None else 0.7 * state.latency + 0.3 * latency
+                state.height = int(tip['height'])
+                state.healthy = True
+                state.failures = 0
+            else:
+                state.healthy = False
+                state.failures += 1
+        return state
+
+    def probe_all(self):
+        with ThreadPoolExecutor(max_workers=len(self.nodes)) as pool:
+            return list(pool.map(self.probe, list(self.nodes.keys())))
+
+    def ranked(self, exclude: tuple = ()) -> list:
+        """
+        Node addresses in order of preference: healthy nodes near the tip by latency,
+        then lagging healthy nodes by height, then failing nodes
+        """
+        with self._lock:
+            nodes = [state for address, state in self.nodes.items() if address not in exclude]
+            best = max((state.height for state in nodes if state.healthy), default=0)
+
+        order = list(self.nodes.keys())
+
+        def key(state: NodeState):
+            near_tip = state.healthy and state.height >= best - self.max_lag
+            latency = state.latency if state.latency is not None else float('inf')
+            if near_tip:
+                return 0, latency, order.index(state.address)
+            if state.healthy:
+                return 1, -state.height, latency
+            return 2, state.failures, order.index(state.address)
+
+        return [state.address for state in sorted(nodes, key=key)]
+
+    def select(self, exclude: tuple = ()) -> str:
+        """Return address of the best node right now"""
+        ranked = self.ranked(exclude=exclude)
+        return ranked[0] if ranked else list(self.nodes.keys())[0]
+
+    def mark_failed(self, address: str):
+        """Report node which failed during command, it's probed again by background thread"""
+        with self._lock:
+            if address in self.nodes:
+                self.nodes[address].healthy = False
+                self.nodes[address].failures += 1
+        self._wakeup.set()
+
+    def _run(self):
+        while self._running.is_set():
+            self.probe_all()
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def start(self):
+        """Start background probing thread"""
+        if not self._thread:
+            self._running.set()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
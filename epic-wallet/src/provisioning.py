@@ -0,0 +1,106 @@
+import socket
+import glob
+import os
+
+from log_symbols import LogSymbols
+
+from .binary_api import BINARY_API
+from .wallet_config import Config
+
+
+def port_available(port: int, host: str = '127.0.0.1') -> bool:
+    """Check if TCP port can be bound on given interface"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind((host, port))
+            return True
+        except OSError:
+            return False
+
+
+def allocate_ports(count: int, start: int, taken: set = None, host: str = '127.0.0.1') -> list:
+    """Return :param count: free ports from :param start: up, skipping ports in :param taken:"""
+    taken = set(taken) if taken else set()
+    ports = []
+    port = start
+    while len(ports) < count:
+        if port > 65535:
+            raise RuntimeError(f"Not enough free ports above {start}")
+        if port not in taken and port_available(port, host):
+            ports.append(port)
+            taken.add(port)
+        port += 1
+    return ports
+
+
+def used_ports(base_dir: str) -> set:
+    """Owner/foreign API ports already assigned in epic-wallet.toml files under :param base_dir:"""
+    ports = set()
+    for config_path in glob.glob(os.path.join(base_dir, '*', 'epic-wallet.toml')):
+        try:
+            settings = Config(config_path=config_path).settings.get('wallet', {})
+        except (OSError, ValueError) as e:
+            print(f"{LogSymbols.WARNING.value} Can't read {config_path}: {e}")
+            continue
+        for key in ('owner_api_listen_port', 'api_listen_port'):
+            if settings.get(key):
+                ports.add(int(settings[key]))
+    return ports
+
+
+def provision_wallets(binary: BINARY_API, count: int, base_dir: str, password: str,
+                      name_prefix: str = 'wallet', base_port: int = 23415,
+                      short_wordlist: bool = False, settings: dict = None) -> list:
+    """
+    Create :param count: wallets in parallel, each in its own directory
+    (base_dir/name_prefix_N, next N not used by existing wallet), assign free
+    owner/foreign API ports (not used by other wallets in base_dir) and write
+    them to every epic-wallet.toml in single pass.
+
+    :param settings: dict, extra [wallet] settings written to each config, e.g. check_node_api_http_addr
+    :return: list of dicts: {name, data_dir, config_path, mnemonic,
+                             owner_api_listen_port, api_listen_port}
+    """
+    extra_args = ['-h']
+    if short_wordlist:
+        extra_args += ['-s', '--short_wordlist']
+
+    jobs = []
+    index = 0
+    while len(jobs) < count:
+        name = f"{name_prefix}_{index}"
+        data_dir = os.path.join(base_dir, name)
+        index += 1
+        # Names of existing wallets are skipped, next free index is used instead
+        if os.path.isfile(os.path.join(data_dir, 'epic-wallet.toml')):
+            continue
+        os.makedirs(data_dir, exist_ok=True)
+        future = binary._submit_command(command='init', extra_args=extra_args,
+                                        password=password, cwd=data_dir)
+        jobs.append((name, data_dir, future))
+
+    wallets = []
+    for name, data_dir, future in jobs:
+        process = future.result()
+        if 'completed successfully' in process.stdout:
+            wallets.append({'name': name,
+                            'data_dir': data_dir,
+                            'config_path': os.path.join(data_dir, 'epic-wallet.toml'),
+                            'mnemonic': binary.parse_mnemonic(process.stdout)})
+        else:
+            print(f"{LogSymbols.ERROR.value} {name}: {process.stderr.strip() or process.stdout.strip()}")
+
+    # Two ports per wallet, owner API first, foreign API second, skipping ports
+    # of existing wallets (not running ones wouldn't show as bound)
+    ports = allocate_ports(len(wallets) * 2, start=base_port, taken=used_ports(base_dir))
+    for wallet, owner_port, foreign_port in zip(wallets, ports[0::2], ports[1::2]):
+        wallet['owner_api_listen_port'] = owner_port
+        wallet['api_listen_port'] = foreign_port
+
+        values = dict(settings) if settings else {}
+        values['owner_api_listen_port'] = owner_port
+        values['api_listen_port'] = foreign_port
+        Config(config_path=wallet['config_path']).update(values)
+
+    print(f"{LogSymbols.SUCCESS.value} {len(wallets)}/{count} wallets created in {base_dir}")
+    return wallets
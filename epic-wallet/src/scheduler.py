@@ -0,0 +1,267 @@
+from concurrent.futures import Future
+from typing import Union
+import itertools
+import threading
+import heapq
+import time
+
+from .binary_api import BINARY_API
+from .http_api import HTTP_APIv2
+
+
+# Priority classes, lower value runs first
+SEND = 0
+BALANCE = 1
+HISTORY = 2
+SCAN = 3
+CLASSES = {SEND: 'send', BALANCE: 'balance', HISTORY: 'history', SCAN: 'scan'}
+
+# Operation name: (priority class, is write operation)
+OPERATIONS = {
+    # HTTP_APIv2
+    'init_send_tx': (SEND, True),
+    'tx_lock_outputs': (SEND, True),
+    'finalize_tx': (SEND, True),
+    'post_tx': (SEND, True),
+    'receive_tx': (SEND, False),
+    'cancel_tx': (SEND, True),
+    'issue_invoice_tx': (SEND, True),
+    'process_invoice_tx': (SEND, True),
+    'retrieve_summary_info': (BALANCE, False),
+    'node_height': (BALANCE, False),
+    'retrieve_txs': (HISTORY, False),
+    'retrieve_outputs': (HISTORY, False),
+    'accounts': (HISTORY, False),
+    'create_account_path': (HISTORY, True),
+    'set_active_account': (HISTORY, True),
+    # BINARY_API
+    'send': (SEND, True),
+    'receive': (SEND, True),
+    'finalize': (SEND, True),
+    'cancel': (SEND, True),
+    'invoice': (SEND, True),
+    'process_invoice': (SEND, True),
+    'info': (BALANCE, False),
+    'txs': (HISTORY, False),
+    'outputs': (HISTORY, False),
+    'create_account': (HISTORY, True),
+    'check': (SCAN, True),
+    # WalletSession (gateway)
+    'send_transaction': (SEND, True),
+    'cancel_transaction': (SEND, True),
+    'issue_invoice': (SEND, True),
+    'get_balance': (BALANCE, False),
+    'get_transactions': (HISTORY, False),
+    'get_outputs': (HISTORY, False),
+    'get_account_balances': (HISTORY, False),
+    }
+
+
+class QueueFullError(RuntimeError):
+    """Priority class queue reached its limit"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Operation didn't start before its deadline"""
+
+
+class _Job:
+    def __init__(self, func, args, kwargs, priority, write, deadline):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.write = write
+        self.deadline = deadline
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class WalletScheduler:
+    """
+    Run wallet operations by priority class (send > balance > history > scan).
+    Read operations run concurrently, write operations run alone, so slow scans
+    and history refreshes don't hold up sends and balance checks waiting behind
+    them. Returned futures carry 'queue_wait' and 'execution_time' (seconds).
+
+    :param http: HTTP_APIv2, used for operations given by name
+    :param binary: BINARY_API, used for named operations HTTP_APIv2 doesn't have
+    :param workers: int, max operations running at once
+    :param limits: dict, {priority class: max queued operations}
+    :param deadlines: dict, {priority class: default seconds to start before dropped}
+    """
+
+    def __init__(self, http: HTTP_APIv2 = None, binary: BINARY_API = None, workers: int = 4,
+                 limits: dict = None, deadlines: dict = None):
+        self.http = http
+        self.binary = binary
+        self.workers = workers
+        self.limits = {SEND: 100, BALANCE: 100, HISTORY: 50, SCAN: 2}
+        self.limits.update(limits if limits else {})
+        self.deadlines = deadlines if deadlines else {}
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._queued = {priority: 0 for priority in CLASSES}
+        self._readers = 0
+        self._writer = False
+        self._cond = threading.Condition()
+        self._stats = {priority: {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                                  'expired': 0, 'wait_total': 0.0, 'wait_max': 0.0,
+                                  'exec_total': 0.0, 'exec_max': 0.0}
+                       for priority in CLASSES}
+        self._running = True
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _resolve(self, operation: Union[str, callable]):
+        if callable(operation):
+            return operation
+        for api in (self.http, self.binary):
+            if api and hasattr(api, operation):
+                return getattr(api, operation)
+        raise ValueError(f"Unknown operation '{operation}'")
+
+    def submit(self, operation: Union[str, callable], *args, priority: int = None,
+               write: bool = None, deadline: float = None, **kwargs) -> Future:
+        """
+        Queue operation (HTTP_APIv2/BINARY_API method name or callable), priority
+        class and read/write kind default to OPERATIONS entry for its name.
+        :param deadline: float, seconds from now the operation has to start in
+        """
+        func = self._resolve(operation)
+        name = operation if isinstance(operation, str) else getattr(func, '__name__', '')
+        default_priority, default_write = OPERATIONS.get(name, (HISTORY, True))
+        priority = default_priority if priority is None else priority
+        write = default_write if write is None else write
+        deadline = deadline if deadline is not None else self.deadlines.get(priority)
+
+        job = _Job(func, args, kwargs, priority, write,
+                   time.perf_counter() + deadline if deadline is not None else None)
+
+        with self._cond:
+            if not self._running:
+                raise RuntimeError('Scheduler is stopped')
+            stats = self._stats[priority]
+            if self._queued[priority] >= self.limits.get(priority, float('inf')):
+                stats['rejected'] += 1
+                raise QueueFullError(f"'{CLASSES[priority]}' queue is full "
+                                     f"({self._queued[priority]} operations)")
+            stats['submitted'] += 1
+            self._queued[priority] += 1
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._cond.notify_all()
+
+        return job.future
+
+    def run(self, operation: Union[str, callable], *args, **kwargs):
+        """Submit operation and wait for its result"""
+        return self.submit(operation, *args, **kwargs).result()
+
+    def _can_start(self, job: _Job) -> bool:
+        if job.write:
+            return not self._writer and self._readers == 0
+        return not self._writer
+
+    def _expire(self):
+        """Drop queued jobs which missed their deadline, wherever they are in the queue"""
+        now = time.perf_counter()
+        expired = [entry for entry in self._heap if entry[2].deadline is not None and entry[2].deadline < now]
+        if not expired:
+            return
+
+        self._heap = [entry for entry in self._heap if entry not in expired]
+        heapq.heapify(self._heap)
+        for priority, _, job in expired:
+            self._queued[priority] -= 1
+            # Future cancelled by caller is already done, only its queue slot is freed
+            if job.future.set_running_or_notify_cancel():
+                self._stats[priority]['expired'] += 1
+                job.future.set_exception(DeadlineExceeded(
+                    f"'{CLASSES[priority]}' operation didn't start before deadline"))
+
+    def _next(self) -> Union[_Job, None]:
+        """Take job from head of the queue once it can start, None when stopping"""
+        with self._cond:
+            while True:
+                self._expire()
+
+                if not self._running and not self._heap:
+                    return None
+
+                # Only the head is considered, so waiting write isn't starved by later reads
+                if self._heap and self._can_start(self._heap[0][2]):
+                    priority, _, job = heapq.heappop(self._heap)
+                    self._queued[priority] -= 1
+                    if job.write:
+                        self._writer = True
+                    else:
+                        self._readers += 1
+                    return job
+
+                # Wake up at earliest deadline of any queued job, not only the head's
+                deadlines = [job.deadline for _, _, job in self._heap if job.deadline is not None]
+                self._cond.wait(max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None)
+
+    def _worker(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+
+            started = time.perf_counter()
+            job.future.queue_wait = started - job.submitted
+            if not job.future.set_running_or_notify_cancel():
+                self._finish(job, started, cancelled=True)
+                continue
+            try:
+                result = job.func(*job.args, **job.kwargs)
+                error = None
+            except Exception as e:
+                result, error = None, e
+
+            self._finish(job, started, failed=error is not None)
+            job.future.execution_time = time.perf_counter() - started
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+    def _finish(self, job: _Job, started: float, failed: bool = False, cancelled: bool = False):
+        finished = time.perf_counter()
+        with self._cond:
+            if job.write:
+                self._writer = False
+            else:
+                self._readers -= 1
+            if not cancelled:
+                stats = self._stats[job.priority]
+                stats['failed' if failed else 'completed'] += 1
+                wait, execution = started - job.submitted, finished - started
+                stats['wait_total'] += wait
+                stats['wait_max'] = max(stats['wait_max'], wait)
+                stats['exec_total'] += execution
+                stats['exec_max'] = max(stats['exec_max'], execution)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Per priority class counters, queue depth, queue wait and execution times (seconds)"""
+        with self._cond:
+            report = {}
+            for priority, stats in self._stats.items():
+                done = stats['completed'] + stats['failed']
+                report[CLASSES[priority]] = dict(
+                    stats, queued=self._queued[priority],
+                    wait_avg=stats['wait_total'] / done if done else 0.0,
+                    exec_avg=stats['exec_total'] / done if done else 0.0)
+            return report
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting operations, finish the queued ones"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
@@ -5,8 +5,9 @@ import os
 
 
 # Hide CMD windows while using subprocess
-si = subprocess.STARTUPINFO()
-si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+if platform.system() == 'Windows':
+    si = subprocess.STARTUPINFO()
+    si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
 
 def icon(type_: str):
     return eval(f"LogSymbols.{type_.upper()}.value")
@@ -23,21 +24,6 @@ def normalize(value, dec=8):
         return value
 
 
-def manage_cwd(func):
-    # Save current CWD
-    cwd = os.getcwd()
-
-    def wrapper(*args, **kwargs):
-        # Change CWD to directory right directory
-        os.chdir(args[0].binary_path)
-        return func(*args, **kwargs)
-
-    # Change CWD back to previous
-    os.chdir(cwd)
-
-    return wrapper
-
-
 def kill_process(process):
     if isinstance(process, psutil.Process):
         try:
@@ -20,6 +20,15 @@ class Config:
         else:
             print(f'No config (*.toml) file path provided')
 
+    def update(self, values: dict, category: str = 'wallet'):
+        """Update many keys at once, configuration file is written only once"""
+        if self.config_path:
+            self.settings.setdefault(category, {}).update(values)
+            with open(self.config_path, 'w') as file:
+                toml.dump(self.settings, file)
+        else:
+            print(f'No config (*.toml) file path provided')
+
     def show_config(self):
         if self.config_path:
             for k, v in self.settings.items():
@@ -0,0 +1,43 @@
+import os
+
+from src.accounts import parse_table, parse_txs
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name)) as file:
+        return file.read()
+
+
+def test_parse_table_joins_multiline_titles_and_cells():
+    rows = parse_table(read_fixture('txs.txt'))
+    assert len(rows) == 4
+    assert rows[0]['Type'] == 'Confirmed Coinbase'
+    assert rows[3]['Type'] == 'Sent Tx - Cancelled'
+    assert rows[2]['Num. Inputs'] == '1'
+    assert rows[2]['Amount Debited'] == '4.62962962'
+    assert rows[2]['Net Difference'] == '-1.63762962'
+
+
+def test_parse_txs_returns_owner_api_format():
+    txs = parse_txs(read_fixture('txs.txt'))
+    assert [tx['tx_type'] for tx in txs] == ['ConfirmedCoinbase', 'TxReceived', 'TxSent', 'TxSentCancelled']
+    assert txs[1] == {
+        'id': 1,
+        'tx_type': 'TxReceived',
+        'tx_slate_id': '3bb4b1a5-0f47-4b4b-8f0d-4d3d3a9c8c2e',
+        'creation_ts': '2021-08-02 11:30:12',
+        'confirmed': True,
+        'confirmation_ts': '2021-08-02 11:41:02',
+        'num_inputs': 0,
+        'num_outputs': 1,
+        'amount_credited': 1050000000,
+        'amount_debited': 0,
+        'fee': None,
+        'kernel_excess': None,
+        }
+    assert txs[2]['fee'] == 800000
+    assert txs[2]['amount_debited'] == 462962962
+    assert txs[0]['tx_slate_id'] is None
@@ -0,0 +1,40 @@
+import threading
+import time
+
+import pytest
+
+from src.scheduler import WalletScheduler, DeadlineExceeded, BALANCE, HISTORY, SEND
+
+
+def test_read_behind_write_expires_at_deadline():
+    scheduler = WalletScheduler(workers=2)
+    release = threading.Event()
+    scheduler.submit(release.wait, priority=SEND, write=True)
+    scheduler.submit(lambda: None, priority=SEND, write=True)
+
+    started = time.perf_counter()
+    read = scheduler.submit(lambda: 1, priority=HISTORY, write=False, deadline=0.2)
+    with pytest.raises(DeadlineExceeded):
+        read.result(timeout=2)
+    assert time.perf_counter() - started < 1
+
+    release.set()
+    scheduler.shutdown()
+    assert scheduler.stats()['history']['expired'] == 1
+
+
+def test_cancelled_job_expiry_keeps_worker_running():
+    scheduler = WalletScheduler(workers=1)
+    release = threading.Event()
+    scheduler.submit(release.wait, priority=SEND, write=True)
+
+    read = scheduler.submit(lambda: 1, priority=BALANCE, write=False, deadline=0.2)
+    assert read.cancel()
+    time.sleep(0.4)
+    release.set()
+
+    assert scheduler.submit(lambda: 'done', priority=BALANCE).result(timeout=2) == 'done'
+    stats = scheduler.stats()['balance']
+    assert stats['queued'] == 0
+    assert stats['expired'] == 0
+    scheduler.shutdown()
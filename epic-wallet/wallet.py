@@ -1,10 +1,20 @@
 from typing import Union
+import copy
 import os
 
+from halo import Halo
+
 from src.tools import normalize, get_system, icon
 from src.transaction import Transaction
 from src.wallet_config import Config
 from src.api_manager import API
+from src.invoice_pool import InvoicePool
+from src.node_api import NodeAPI
+from src.node_pool import NodePool
+from src.accounts import AccountManager
+from src.provisioning import provision_wallets
+from src.exporter import TransactionExporter
+from src.scheduler import WalletScheduler
 
 
 class Wallet:
@@ -15,6 +25,8 @@ class Wallet:
         self.cfg = Config()
         self.name = name
         self.listener = None
+        self._accounts = None
+        self._scheduler = None
 
     def load_settings(self, **kwargs) -> None:
         """Load settings from configuration file and/or set epic-wallet binary path"""
@@ -31,6 +43,82 @@ class Wallet:
             except AttributeError:
                 print(icon('error'), 'Wrong configuration file path')
 
+        if 'node_addresses' in kwargs.keys():
+            self.set_node_pool(kwargs['node_addresses'])
+
+    def set_node_pool(self, node_addresses: list, **kwargs) -> NodePool:
+        """Pick the fastest healthy node from the list (plus configured one) for every command"""
+        if self.api.binary.node_pool:
+            self.api.binary.node_pool.stop()
+
+        addresses = [self.api.binary.check_node_api_http_addr] + list(node_addresses)
+        secrets = kwargs.pop('api_secret_paths', {})
+        secrets.setdefault(self.api.binary.check_node_api_http_addr, self._node_secret())
+        pool = NodePool([address for address in addresses if address],
+                        api_secret_paths=secrets, **kwargs).start()
+        self.api.binary.set_node_pool(pool)
+        return pool
+
+    @property
+    def accounts(self) -> AccountManager:
+        """Account-scoped queries, all account switching should go through it"""
+        if not self._accounts:
+            self._accounts = AccountManager(binary=self.api.binary, http=self.api.http)
+        self._accounts.binary, self._accounts.http = self.api.binary, self.api.http
+        return self._accounts
+
+    def get_account_balances(self, password: str, accounts: list = None) -> dict:
+        """Return {account: summary info} for given (or all) accounts, queried concurrently"""
+        if not accounts:
+            owner_api = self.api.binary.start_owner_api(password=password)
+            accounts = [account['label'] for account in self.accounts.accounts()]
+            self.api.binary.stop_listener(owner_api)
+        return self.accounts.summary_info(password=password, accounts=accounts)
+
+    @staticmethod
+    def _quiet(client):
+        """Copy of API client with disabled spinner, shared spinner isn't thread-safe"""
+        if client is None:
+            return None
+        client = copy.copy(client)
+        client.spinner = Halo(enabled=False)
+        return client
+
+    @property
+    def scheduler(self) -> WalletScheduler:
+        """Priority scheduler for owner_api/CLI operations of this wallet"""
+        if not self._scheduler:
+            self._scheduler = WalletScheduler()
+        # Operations run in worker threads, clients get own disabled spinners
+        self._scheduler.http, self._scheduler.binary = self._quiet(self.api.http), self._quiet(self.api.binary)
+        return self._scheduler
+
+    @property
+    def node(self) -> NodeAPI:
+        """Node API client for check_node_api_http_addr, shared by all Wallet instances"""
+        return NodeAPI.shared(self.api.binary.check_node_api_http_addr, api_secret_path=self._node_secret())
+
+    def _node_secret(self) -> Union[str, None]:
+        """Path to node API secret from configuration file, None if not set or missing"""
+        secret = self.cfg.settings['wallet'].get('node_api_secret_path') if self.cfg.config_path else None
+        return secret if secret and os.path.isfile(secret) else None
+
+    def node_height(self) -> Union[int, bool]:
+        """Return chain height straight from the node, no wallet process needed"""
+        return self.node.height()
+
+    def confirmations(self, transaction: Union[dict, int]) -> int:
+        """Number of confirmations for owner_api output/tx dict or block height"""
+        height = transaction
+        if isinstance(transaction, dict):
+            height = transaction.get('height')
+            # Tx log entries have no height, look up their kernel on the node
+            if not height and transaction.get('kernel_excess'):
+                kernel = self.node.get_kernel(transaction['kernel_excess'],
+                                              min_height=transaction.get('kernel_lookup_min_height'))
+                height = kernel['height'] if kernel else None
+        return self.node.confirmations(height)
+
     def update_settings(self, key: str, value: Union[str, int], category: str = 'wallet') -> None:
         """Update settings and save to configuration file"""
         self.cfg.save(key, value, category)
@@ -48,6 +136,24 @@ class Wallet:
             self.load_settings(config_path=os.path.join(path, 'epic-wallet.toml'))
             print(self.cfg.settings['wallet']['data_file_dir'])
 
+    @classmethod
+    def provision(cls, count: int, base_dir: str, password: str, binary_path: str, **kwargs) -> list:
+        """
+        Create many wallets in parallel (base_dir/wallet_N) with non-colliding API ports,
+        return list of (Wallet, mnemonic) with settings loaded and ready to use
+        """
+        wallet = cls(name='provisioning')
+        wallet.load_settings(binary_path=binary_path)
+        created = provision_wallets(wallet.api.binary, count=count, base_dir=base_dir,
+                                    password=password, **kwargs)
+
+        wallets = []
+        for info in created:
+            handle = cls(name=info['name'])
+            handle.load_settings(binary_path=binary_path, config_path=info['config_path'])
+            wallets.append((handle, info['mnemonic']))
+        return wallets
+
     def get_balance(self, password: str):
         balance = False
         owner_api = self.api.binary.start_owner_api(password=password)
@@ -90,6 +196,14 @@ class Wallet:
         self.api.binary.stop_listener(owner_api)
         return transactions[:length]
 
+    def export_transactions(self, password: str, file_path: str, **kwargs) -> dict:
+        """Stream transaction history to CSV/Parquet file, see TransactionExporter.export"""
+        owner_api = self.api.binary.start_owner_api(password=password)
+        try:
+            return TransactionExporter(http=self.api.http).export(file_path=file_path, **kwargs)
+        finally:
+            self.api.binary.stop_listener(owner_api)
+
     def send_transaction(self,
                          transaction: Union[Transaction, dict],
                          password: str, account: str = None) -> Union[Transaction, bool]:
@@ -118,3 +232,16 @@ class Wallet:
         else:
             print(f"{icon('warning')} To cancel provide transaction ID or UUID")
 
+    def issue_invoice(self, amount: Union[int, float, str], password: str, file_path: str,
+                      message: str = '', account: str = None) -> Union[str, bool]:
+        """Create invoice transaction file, return its path"""
+        return self.api.binary.invoice(amount=amount, file_path=file_path, message=message,
+                                       password=password, account=account)
+
+    def pay_invoice(self, file_path: str, password: str, account: str = None) -> bool:
+        """Pay invoice transaction file, response file has to be send back to issuer"""
+        return self.api.binary.process_invoice(file_path=file_path, password=password, account=account)
+
+    def invoice_pool(self, amounts: list, **kwargs):
+        """Return InvoicePool for given amounts (in base units), owner_api has to be running"""
+        return InvoicePool(http=self.api.http, amounts=amounts, **kwargs)